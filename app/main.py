@@ -3,7 +3,9 @@ import datetime
 from typing import List, Dict
 
 from config import config
-from logging_config import logger
+from crawler.cursor_store import commit_source_cursors, rollback_source_cursors
+from crawler.http_pool import close_http_session
+from logging_config import logger, setup_logging
 from scheduler.task_scheduler import task_scheduler
 
 from nlp.processor import EnhancedNewsProcessor
@@ -18,7 +20,7 @@ class NewsMonitorApp:
         Base.metadata.create_all(self.engine)
         self.Session = sessionmaker(bind=self.engine)
 
-        # 初始化处理器
+        # 初始化处理器（嵌入模型延迟加载）
         self.processor = EnhancedNewsProcessor()
 
         # 注册定时任务
@@ -68,25 +70,35 @@ class NewsMonitorApp:
 
             # 处理新闻
             processed_count = 0
+            failed_count = 0
             black_swan_count = 0
 
-            for item in news_items:
+            # 批量生成嵌入并并发分析，比逐条处理快得多；处理失败的条目为 None
+            processed_items = await self.processor.process_news_batch(news_items)
+
+            for processed in processed_items:
+                if processed is None:
+                    failed_count += 1
+                    continue
                 try:
-                    processed = await self.processor.process_news_async(item)
                     await self._save_news_item(processed)
 
                     processed_count += 1
-                    if processed['is_black_swan']:
+                    # 近重复条目沿用簇内第一条的结果，只对第一条报警
+                    if processed['is_black_swan'] and not processed.get('is_duplicate'):
                         black_swan_count += 1
                         await self._alert_black_swan(processed)
 
                 except Exception as e:
                     logger.error(f"处理新闻失败: {e}")
 
-            logger.info(f"处理完成: {processed_count} 条新闻, {black_swan_count} 条黑天鹅事件")
+            logger.info(f"处理完成: {processed_count} 条新闻, {black_swan_count} 条黑天鹅事件, {failed_count} 条失败")
+            # 本轮条目处理完成后才推进各源高水位；任务中途失败时下次抓取会重新得到这些条目
+            commit_source_cursors()
 
         except Exception as e:
             logger.error(f"主要抓取任务执行失败: {e}")
+            rollback_source_cursors()
 
     async def quick_check_task(self):
         """快速检查任务"""
@@ -98,6 +110,8 @@ class NewsMonitorApp:
         """每日清理任务"""
         logger.info("执行每日清理任务...")
         # 清理旧数据、优化数据库等
+        evicted = self.processor.cleanup()
+        logger.info(f"嵌入索引清除过期条目: {evicted}")
 
     async def status_report_task(self):
         """状态报告任务"""
@@ -159,12 +173,18 @@ class NewsMonitorApp:
         logger.info(f"抓取间隔: {config.CRAWL_INTERVAL_MINUTES} 分钟")
         logger.info(f"新闻源数量: {len(config.NEWS_SOURCES)}")
 
+        # 后台预加载嵌入模型，调度器和抓取不必等待模型加载完成
+        if config.EMBEDDING_WARMUP:
+            self.processor.warm_up()
+
         # 启动调度器
         task_scheduler.start()
 
 
 # 应用启动
 if __name__ == "__main__":
+    setup_logging()
+
     # 创建事件循环
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
@@ -178,5 +198,5 @@ if __name__ == "__main__":
         logger.error(f"应用启动失败: {e}")
     finally:
         # 清理资源
-        loop.run_until_complete(crawler_service.close_session())
+        loop.run_until_complete(close_http_session())
         loop.close()
\ No newline at end of file
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+去重后端基准：比较嵌入式 SQLite 后端与 Redis 后端的批量检查耗时。
+
+用法:
+    python -m benchmarks.dedup_bench -n 20000 -b 50
+Redis 使用 Config.REDIS_HOST 等配置，连接不上时跳过。
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from crawler.dedup_backends import DedupUnavailableError, RedisDedupBackend, SQLiteDedupBackend
+
+
+def _run_pass(backend, keys, batch_size):
+    """返回 (每条耗时 微秒, 新键数量)"""
+    new_count = 0
+    start = time.perf_counter()
+    for i in range(0, len(keys), batch_size):
+        new_count += sum(backend.check_and_add_many(keys[i:i + batch_size]))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(keys) * 1e6, new_count
+
+
+def bench(name, backend, count, batch_size):
+    prefix = f"bench-{time.time_ns()}"
+    keys = [f"https://example.com/{prefix}/{i}" for i in range(count)]
+    new_us, new_count = _run_pass(backend, keys, batch_size)
+    dup_us, dup_new = _run_pass(backend, keys, batch_size)
+    start = time.perf_counter()
+    for key in keys[:1000]:
+        backend.contains(key)
+    contains_us = (time.perf_counter() - start) / min(count, 1000) * 1e6
+    print(f"{name:<8} 新键 {new_us:8.1f} us/条  重复键 {dup_us:8.1f} us/条  "
+          f"单键查询 {contains_us:8.1f} us  (新 {new_count}, 重复轮误判为新 {dup_new})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="去重后端基准")
+    parser.add_argument('-n', '--count', type=int, default=20000, help='键数量')
+    parser.add_argument('-b', '--batch-size', type=int, default=50, help='每批键数量（对应一次轮询）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteDedupBackend(30, path=os.path.join(tmp, 'dedup.db'))
+        bench('sqlite', backend, args.count, args.batch_size)
+        backend.close()
+
+    try:
+        backend = RedisDedupBackend(30)
+        backend.redis.ping()
+    except Exception as e:
+        print(f"redis    跳过: {e}")
+        return
+    try:
+        bench('redis', backend, args.count, args.batch_size)
+    except DedupUnavailableError as e:
+        print(f"redis    失败: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+嵌入后端基准：在固定的中文财经新闻语料上比较 PyTorch 全精度与 ONNX int8 后端。
+
+输出两个后端的编码耗时，以及 int8 嵌入相对全精度嵌入的余弦偏差
+（1 - 同一文本两种嵌入的余弦相似度）和最近邻一致率。
+最大偏差超过 --tolerance 时以非零状态退出。
+
+用法:
+    python -m nlp.embedding_backends export     # 先导出量化模型
+    python -m benchmarks.embedding_bench --threads 4 --tolerance 0.02
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from config import Config
+from nlp.embedding_backends import OnnxEmbeddingBackend, TorchEmbeddingBackend
+
+CORPUS = [
+    "美联储宣布维持联邦基金利率目标区间不变，符合市场预期",
+    "美联储主席鲍威尔表示，通胀仍然高于2%的目标，降息需要更多证据",
+    "央行开展1000亿元7天期逆回购操作，中标利率持平于1.8%",
+    "中国人民银行宣布下调金融机构存款准备金率0.5个百分点",
+    "国家统计局：10月份CPI同比上涨0.2%，PPI同比下降2.6%",
+    "财政部拟发行特别国债1万亿元，用于支持重大项目建设",
+    "沪指午后震荡走高，收复3000点，成交额连续三日突破万亿",
+    "创业板指大跌3%，半导体板块领跌，多只个股跌停",
+    "北向资金今日净买入超80亿元，贵州茅台获大幅加仓",
+    "人民币兑美元中间价上调120个基点，报7.1058",
+    "离岸人民币盘中跌破7.30关口，创年内新低",
+    "国际油价大涨5%，沙特宣布延长自愿减产至年底",
+    "现货黄金突破2400美元/盎司，再创历史新高",
+    "伦铜期货价格跌至三个月低位，需求前景担忧加剧",
+    "某头部房企宣布境外债务重组方案获债权人通过",
+    "某大型开发商未能按期支付美元债利息，进入30天宽限期",
+    "多地放宽限购政策，一线城市首套房贷利率下调",
+    "宁德时代发布新一代麒麟电池，续航突破1000公里",
+    "比亚迪10月新能源汽车销量突破30万辆，同比增长38%",
+    "苹果公司发布财报，大中华区营收同比下降2.5%",
+    "英伟达市值突破3万亿美元，超越苹果成为全球第二",
+    "台积电宣布在美国亚利桑那州新建第三座晶圆厂",
+    "美国商务部升级对华芯片出口管制，限制先进AI芯片出口",
+    "欧盟对中国电动汽车加征临时反补贴关税",
+    "日本央行宣布结束负利率政策，为17年来首次加息",
+    "日元兑美元跌破160，日本财务省疑似入市干预",
+    "瑞士信贷被瑞银集团以30亿瑞郎紧急收购",
+    "硅谷银行因挤兑倒闭，美国监管机构接管其存款",
+    "某地发生7.1级地震，当地多家工厂暂时停产",
+    "红海航运受阻，集装箱运价一周内上涨超过40%",
+    "中东局势骤然升级，避险情绪推动美债收益率下行",
+    "证监会发布新规，严格限制上市公司大股东减持",
+    "沪深交易所宣布暂停转融券业务，自下周一起实施",
+    "某知名白酒企业董事长被立案调查，股价开盘跌停",
+    "某互联网巨头宣布大规模裁员，涉及员工约一万人",
+    "OPEC+会议意外决定增产，原油价格盘中暴跌8%",
+    "美国非农就业人口增加30.3万，远超市场预期",
+    "美国10年期国债收益率升至5%，为2007年以来首次",
+    "恒生指数单日暴涨6%，创2008年以来最大单日涨幅",
+    "国务院常务会议部署稳增长措施，加大消费支持力度",
+]
+
+
+def bench(backend, texts, batch_size, repeat):
+    backend.encode(texts[:batch_size], batch_size=batch_size)  # 预热
+    start = time.perf_counter()
+    for _ in range(repeat):
+        embeddings = backend.encode(texts, batch_size=batch_size)
+    elapsed = (time.perf_counter() - start) / repeat
+    return embeddings, elapsed / len(texts) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="嵌入后端基准")
+    parser.add_argument('--threads', type=int, default=Config.EMBEDDING_THREADS, help='CPU 推理线程数')
+    parser.add_argument('-b', '--batch-size', type=int, default=Config.EMBEDDING_BATCH_SIZE)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.02, help='允许的最大余弦偏差')
+    args = parser.parse_args()
+
+    torch_backend = TorchEmbeddingBackend(Config.EMBEDDING_MODEL, args.threads)
+    onnx_backend = OnnxEmbeddingBackend(Config.EMBEDDING_ONNX_DIR, args.threads, Config.EMBEDDING_MAX_LENGTH)
+
+    reference, torch_ms = bench(torch_backend, CORPUS, args.batch_size, args.repeat)
+    quantized, onnx_ms = bench(onnx_backend, CORPUS, args.batch_size, args.repeat)
+
+    drift = 1 - np.sum(reference * quantized, axis=1)
+    # 最近邻一致率：每条文本在语料中最相似的另一条是否相同
+    ref_sims = reference @ reference.T
+    q_sims = quantized @ quantized.T
+    np.fill_diagonal(ref_sims, -1)
+    np.fill_diagonal(q_sims, -1)
+    agreement = np.mean(ref_sims.argmax(axis=1) == q_sims.argmax(axis=1))
+
+    print(f"语料 {len(CORPUS)} 条, batch {args.batch_size}, 线程 {args.threads}")
+    print(f"torch     {torch_ms:8.2f} ms/条")
+    print(f"onnx-int8 {onnx_ms:8.2f} ms/条  加速 {torch_ms / onnx_ms:.2f}x")
+    print(f"余弦偏差  平均 {drift.mean():.4f}  最大 {drift.max():.4f}  (容差 {args.tolerance})")
+    print(f"最近邻一致率 {agreement:.2%}")
+
+    if drift.max() > args.tolerance:
+        print("余弦偏差超出容差")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+HTML 解析后端微基准：在保存的页面样本上比较 selectolax / lxml / bs4。
+
+用法:
+    python -m benchmarks.html_parser_bench --save     # 抓取线上页面保存为样本
+    python -m benchmarks.html_parser_bench -n 50      # 运行基准
+样本目录中缺少某个页面时，使用按页面结构生成的合成页面代替。
+"""
+
+import argparse
+import os
+import statistics
+import time
+import urllib.request
+
+from crawler.html_parser import available_backends
+from services.fastbull import parse_fastbull_express, parse_fastbull_news
+from services.gelonghui import parse_gelonghui
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+PAGES = {
+    'fastbull_express': ("https://www.fastbull.com/cn/express-news", parse_fastbull_express),
+    'fastbull_news': ("https://www.fastbull.com/cn/news", parse_fastbull_news),
+    'gelonghui': ("https://www.gelonghui.com/news/", parse_gelonghui),
+}
+
+
+def _synthetic_page(name: str, items: int = 200) -> str:
+    """按页面的实际选择器结构生成合成页面"""
+    rows = []
+    for i in range(items):
+        if name == 'fastbull_express':
+            rows.append(f'<div class="news-list" data-date="{1700000000000 + i}">'
+                        f'<a class="title_name" href="/cn/express-news/{i}">【快讯标题{i}】正文内容{i}</a></div>')
+        elif name == 'fastbull_news':
+            rows.append(f'<a class="trending_type" href="/cn/news/{i}"><div class="title">新闻标题{i}</div>'
+                        f'<p class="brief ltr_ar_dir">摘要{i}</p><span data-date="{1700000000000 + i}"></span></a>')
+        else:
+            rows.append(f'<div class="article-content"><div class="detail-right"><a href="/news/{i}">'
+                        f'<h2>格隆汇标题{i}</h2><summary>摘要{i}</summary></a></div>'
+                        f'<p class="time"><span>格隆汇</span><span>2024-01-01 10:{i % 60:02d}</span></p></div>')
+    filler = '<div class="nav"><ul>' + '<li><a href="#">菜单</a></li>' * 100 + '</ul></div>'
+    return f'<html><head><title>{name}</title></head><body>{filler}{"".join(rows)}{filler}</body></html>'
+
+
+def load_fixture(name: str) -> str:
+    path = os.path.join(FIXTURE_DIR, f'{name}.html')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return _synthetic_page(name)
+
+
+def save_fixtures() -> None:
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, (url, _) in PAGES.items():
+        request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            html = response.read().decode('utf-8', errors='replace')
+        with open(os.path.join(FIXTURE_DIR, f'{name}.html'), 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f"已保存 {name}: {len(html)} 字符")
+
+
+def run(iterations: int) -> None:
+    backends = available_backends()
+    print(f"可用后端: {', '.join(backends)}")
+    for name, (_, parse) in PAGES.items():
+        html = load_fixture(name)
+        baseline = None
+        print(f"\n{name} ({len(html)} 字符)")
+        for backend in backends:
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                result = parse(html, backend)
+                timings.append((time.perf_counter() - start) * 1000)
+            if baseline is None:
+                baseline = result
+            same = "一致" if result == baseline else "不一致"
+            print(f"  {backend:<10} 中位数 {statistics.median(timings):8.2f} ms  "
+                  f"最小 {min(timings):8.2f} ms  条目 {len(result):4d}  结果{same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 解析后端微基准")
+    parser.add_argument('--save', action='store_true', help='抓取线上页面保存为样本')
+    parser.add_argument('-n', '--iterations', type=int, default=20, help='每个后端的运行次数')
+    args = parser.parse_args()
+    if args.save:
+        save_fixtures()
+    run(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
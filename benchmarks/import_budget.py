@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+启动耗时预算检查：在全新的解释器中分别导入各入口模块，检查导入耗时是否在预算内，
+并确认导入时没有提前加载 torch、litellm 等重量级依赖。
+任一检查失败时以非零状态退出，可放在 CI 中运行。
+
+用法:
+    python -m benchmarks.import_budget
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+# (模块, 导入耗时预算 秒)
+BUDGETS = [
+    ('manage', 0.5),
+    ('nlp.processor', 1.0),
+    ('app.main', 2.0),
+]
+
+# 只允许在首次使用时导入的重量级依赖
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'transformers', 'onnxruntime', 'litellm', 'openai')
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+except ImportError as e:
+    print(json.dumps({'skipped': str(e)}))
+    sys.exit(0)
+elapsed = time.perf_counter() - start
+heavy = [m for m in sys.argv[2:] if m in sys.modules]
+print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def probe(module):
+    out = subprocess.run(
+        [sys.executable, '-c', _PROBE, module, *HEAVY_MODULES],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def cli_cold_start():
+    """manage.py --help 的端到端耗时（含解释器启动）"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'manage.py', '--help'], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    failed = False
+    for module, budget in BUDGETS:
+        result = probe(module)
+        if 'skipped' in result:
+            print(f"{module:<16} 跳过: {result['skipped']}")
+            continue
+        ok = result['elapsed'] <= budget and not result['heavy']
+        failed |= not ok
+        heavy = f"  提前导入: {', '.join(result['heavy'])}" if result['heavy'] else ''
+        print(f"{module:<16} {result['elapsed'] * 1000:8.1f} ms  (预算 {budget * 1000:.0f} ms) "
+              f"{'OK' if ok else 'FAIL'}{heavy}")
+
+    elapsed = cli_cold_start()
+    ok = elapsed < 1.0
+    failed |= not ok
+    print(f"{'manage.py --help':<16} {elapsed * 1000:8.1f} ms  (预算 1000 ms) {'OK' if ok else 'FAIL'}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,34 @@ class Config:
     OPENAI_API_KEY = os.getenv('DEEPSEEK_API_KEY')
     OPENAI_MODEL = os.getenv('MODEL')
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-base-zh-v1.5")
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # torch / onnx（int8 量化）
+    EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", "data/onnx/bge-base-zh-v1.5-int8")
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "4"))  # CPU 推理线程数
+    EMBEDDING_MAX_LENGTH = 512
+    EMBEDDING_WARMUP = True  # 启动时在后台线程预加载嵌入模型
+    EMBEDDING_BATCH_SIZE = 32  # 批量生成嵌入时每批的条数
+    LLM_MAX_CONCURRENCY = 5  # 批量处理时并发的 GPT 请求数
+    EMBEDDING_CACHE_DIR = "embedding_cache"  # 位于 STATE_DIR 下
+    EMBEDDING_CACHE_CAPACITY = 50000  # 磁盘缓存条数，满后淘汰最早写入的
+    EMBEDDING_CACHE_LRU_SIZE = 2048  # 内存 LRU 条数
     OPENAI_MAX_TOKENS = 1000
     OPENAI_TEMPERATURE = 0.1
+    LLM_CACHE_DB = "llm_cache.db"  # 分类结果缓存，位于 STATE_DIR 下
+    LLM_CACHE_TTL = 7 * 86400  # 缓存有效期（秒）
 
     RSSHUB_URL = os.getenv("RSSHUB_URL", "http://106.13.122.211:1200/")
 
     # 数据库配置
     DATABASE_URL = "sqlite:///news.db"
 
+    # JSON 解码库：auto / orjson / msgspec / json
+    JSON_BACKEND = os.getenv("JSON_BACKEND", "auto")
+
+    # 本地状态存储（HTTP 校验信息等）
+    STATE_DIR = os.getenv("STATE_DIR", "data")
+    CRAWLER_STATE_DB = "crawler_state.db"
+    CURSOR_RECENT_IDS = 500  # 每个快讯源记住的最近已处理 id 数量
+
     # 调度配置
     CRAWL_INTERVAL_MINUTES = 30  # 主要抓取间隔
     QUICK_CHECK_INTERVAL_MINUTES = 5  # 快速检查间隔
@@ -30,10 +50,81 @@ class Config:
     USER_AGENT = "BlackSwanMonitor/1.0 (+http://example.com/bot)"
     REQUEST_TIMEOUT = 30
     MAX_CONCURRENT_REQUESTS = 5
+    RSS_STREAMING = True  # 网关的 RSS 源流式解析，遇到已处理的条目即停止读取
+
+    # HTTP 连接池配置
+    HTTP_POOL_LIMIT = 100  # 总连接数
+    HTTP_POOL_LIMIT_PER_HOST = 10  # 每个主机的连接数
+    HTTP_DNS_CACHE_TTL = 300  # DNS 缓存时间（秒）
+    HTTP_KEEPALIVE_TIMEOUT = 60  # 空闲连接保活时间（秒）
+
+    # 去重存储后端：redis / sqlite（单机、离线部署使用嵌入式 SQLite，无需外部服务）
+    DEDUP_BACKEND = os.getenv("DEDUP_BACKEND", "redis")
+    DEDUP_SQLITE_DB = "dedup.db"
+    REDIS_HOST = os.getenv("REDIS_HOST", "100.107.167.15")
+    REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+    REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+
+    # 去重进程内前置缓存
+    DEDUP_LRU_SIZE = 50000  # 最近键 LRU 容量
+    DEDUP_BLOOM_CAPACITY = 200000  # 每代布隆过滤器容量
+    DEDUP_BLOOM_ERROR_RATE = 0.01
+    DEDUP_BLOOM_WINDOW = 24 * 60 * 60  # 每代布隆过滤器覆盖的时间（秒）
+
+    # 财联社文章详情缓存
+    CLS_DETAIL_CACHE_SIZE = 1000
+    CLS_DETAIL_CACHE_TTL = 6 * 60 * 60  # 秒
+
+    # 雪球 cookies 缓存时间（秒）
+    XUEQIU_COOKIE_TTL = 30 * 60
+
+    # HTML 解析配置
+    HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto")  # auto / selectolax / lxml / bs4
+    HTML_PARSER_POOL = "process"  # process / thread
+    HTML_PARSER_WORKERS = 2
+
+    # 按主机限流（令牌桶：rate 每秒令牌数，burst 桶容量）
+    DEFAULT_HOST_RATE_LIMIT = {'rate': 5.0, 'burst': 10}
+    HOST_RATE_LIMITS = {
+        'www.jin10.com': {'rate': 1.0, 'burst': 2},
+        'www.cls.cn': {'rate': 1.0, 'burst': 3},
+    }
+
+    # 熔断配置
+    CIRCUIT_FAILURE_THRESHOLD = 5  # 连续失败多少次后打开熔断
+    CIRCUIT_RECOVERY_TIMEOUT = 60  # 熔断打开后多久进入半开状态（秒）
+    CIRCUIT_HALF_OPEN_MAX_CALLS = 1  # 半开状态允许的探测请求数
+
+    # 新闻源超时配置（秒），SOURCE_TIMEOUTS 中未配置的源使用 SOURCE_TIMEOUT
+    SOURCE_TIMEOUT = 20
+    SOURCE_TIMEOUTS = {
+        'rss': 45,
+        'gelonghui': 30,
+    }
 
     # 分类阈值
     BLACK_SWAN_THRESHOLD = 0.7
 
+    # 跨源近重复聚类
+    NEAR_DUP_WINDOW_SECONDS = 30 * 60  # 滚动时间窗口（秒）
+    NEAR_DUP_THRESHOLD = 0.5  # 字符二元组 Jaccard 相似度阈值
+
+    # 意外性评分
+    SURPRISE_WINDOW = 100  # 参与比较的最近新闻条数
+    SURPRISE_AGGREGATION = "mean"  # mean / max / topk
+    SURPRISE_TOP_K = 10  # topk 聚合时取最相似的条数
+    SURPRISE_DTYPE = "float32"  # 嵌入历史的存储精度，可选 float16 减半内存
+
+    # 长周期意外性：磁盘持久化的 IVF 近似最近邻索引
+    EMBEDDING_INDEX_DIR = "embedding_index"  # 位于 STATE_DIR 下
+    EMBEDDING_INDEX_CAPACITY = 300000  # 最多保留的嵌入条数（768 维 float16 约 440MB 磁盘）
+    EMBEDDING_INDEX_NLIST = 256  # 倒排表（聚类中心）数量
+    EMBEDDING_INDEX_NPROBE = 8  # 每次查询扫描的倒排表数量
+    EMBEDDING_INDEX_DTYPE = "float16"
+    EMBEDDING_INDEX_RETENTION_DAYS = 30
+    SURPRISE_INDEX_TOP_K = 10  # 与长周期历史中最相似的 k 条比较
+    SURPRISE_LONG_WEIGHT = 0.5  # 长周期意外性在最终意外性分数中的权重
+
     # 新闻源配置
     NEWS_SOURCES = {
         'reuters': {
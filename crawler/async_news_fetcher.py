@@ -1,22 +1,155 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import aiohttp
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from crawler.host_guard import get_host_guard
+from crawler.http_cache import PendingValidators, content_hash, get_validator_store, new_content_hasher
+from crawler.http_pool import get_http_session
+from crawler.json_codec import decode
+
+
+@asynccontextmanager
+async def _guarded_get(url, timeout=10, params=None, headers=None):
+    """经过主机限流和熔断检查的 GET 请求，并把结果反馈给熔断器"""
+    guard = get_host_guard(url)
+    await guard.acquire()  # 熔断打开时抛出 CircuitOpenError，不会被重试
+    recorded = False
+    try:
+        session = await get_http_session()
+        async with session.get(url, params=params, headers=headers,
+                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            # 5xx 和 429（被限流）视为主机异常
+            if response.status >= 500 or response.status == 429:
+                guard.breaker.record_failure()
+            else:
+                guard.breaker.record_success()
+            recorded = True
+            yield response
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        if not recorded:
+            guard.breaker.record_failure()
+            recorded = True
+        raise
+    finally:
+        # 被取消（如 wait_for 超时）或其他异常中止时没有结果，归还半开探测名额，
+        # 否则熔断器会一直停留在半开并拒绝所有请求
+        if not recorded:
+            guard.breaker.release_probe()
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception_type(aiohttp.ClientError)  # 只对网络异常重试
+)
+async def fetch_url(rss_url, timeout=10, max_retries=3, params=None, headers=None):
+    async with _guarded_get(rss_url, timeout, params, headers) as response:
+        return await response.text() # 返回 RSS XML 内容
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception_type(aiohttp.ClientError)  # 只对网络异常重试
+)
+async def fetch_url_json(rss_url, timeout=10, params=None, headers=None, schema=None):
+    async with _guarded_get(rss_url, timeout, params, headers) as response:
+        body = await response.read()
+    return decode(body, schema) # 返回 JSON 内容，schema 见 crawler.json_schemas
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=1, max=10),
     retry=retry_if_exception_type(aiohttp.ClientError)  # 只对网络异常重试
 )
-async def fetch_url(rss_url, timeout=10, max_retries=3):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(rss_url, timeout=timeout) as response:
-            return await response.text() # 返回 RSS XML 内容
+async def fetch_cookies(url, timeout=10, headers=None):
+    """请求页面，返回响应中设置的 cookies（全局会话不保存 cookies，由调用方自行管理）"""
+    async with _guarded_get(url, timeout, None, headers) as response:
+        response.raise_for_status()
+        return {name: morsel.value for name, morsel in response.cookies.items()}
 
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=1, max=10),
     retry=retry_if_exception_type(aiohttp.ClientError)  # 只对网络异常重试
 )
-async def fetch_url_json(rss_url, timeout=10):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(rss_url, timeout=timeout) as response:
-            return await response.json() # 返回 RSS XML 内容
+async def _fetch_if_changed(url, timeout=10, params=None, headers=None, cache_key=None):
+    """
+    条件请求：携带 If-None-Match / If-Modified-Since。
+
+    返回:
+        (body, encoding, validators)；服务器返回 304 或内容哈希与上次一致时返回
+        (None, None, None)。validators 为 PendingValidators，调用方解析成功后再 commit()。
+    """
+    store = get_validator_store()
+    key = cache_key or url
+    request_headers = {**(headers or {}), **store.conditional_headers(key)}
+
+    async with _guarded_get(url, timeout, params, request_headers) as response:
+        if response.status == 304:
+            return None, None, None
+        response.raise_for_status()
+        body = await response.read()
+        encoding = response.get_encoding()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+    body_hash = content_hash(body)
+    if store.is_same_body(key, body_hash):
+        # 内容与上次成功解析的一致，直接更新校验信息
+        store.update(key, etag, last_modified, body_hash)
+        return None, None, None
+    validators = PendingValidators()
+    validators.set(store, key, etag, last_modified, body_hash)
+    return body, encoding, validators
+
+async def fetch_url_if_changed(url, timeout=10, params=None, headers=None, cache_key=None):
+    """
+    抓取文本内容。
+
+    返回:
+        (text, validators)；内容自上次抓取后未变化时返回 (None, None)，调用方可跳过解析。
+        调用方解析成功后调用 validators.commit() 保存校验信息。
+    """
+    body, encoding, validators = await _fetch_if_changed(url, timeout, params, headers, cache_key)
+    if body is None:
+        return None, None
+    return body.decode(encoding or 'utf-8', errors='replace'), validators
+
+async def fetch_url_json_if_changed(url, timeout=10, params=None, headers=None, cache_key=None, schema=None):
+    """抓取 JSON 内容，返回 (data, validators)，约定同 fetch_url_if_changed"""
+    body, _, validators = await _fetch_if_changed(url, timeout, params, headers, cache_key)
+    if body is None:
+        return None, None
+    return decode(body, schema), validators
+
+async def iter_url_chunks(url, chunk_size=16 * 1024, timeout=30, params=None, headers=None,
+                          cache_key=None, conditional=True, validators=None):
+    """
+    按块读取响应体（用于流式解析）。conditional 为 True 时携带条件请求头，
+    服务器返回 304 时不产出任何数据。流式读取无法重放，因此不做重试。
+    读取结束后把校验信息写入 validators（PendingValidators），由调用方解析成功后 commit()。
+    """
+    store = get_validator_store()
+    key = cache_key or url
+    request_headers = dict(headers or {})
+    if conditional:
+        request_headers.update(store.conditional_headers(key))
+
+    async with _guarded_get(url, timeout, params, request_headers) as response:
+        if response.status == 304:
+            return
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        hasher = new_content_hasher()
+        completed = False
+        try:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                hasher.update(chunk)
+                yield chunk
+            completed = True
+        finally:
+            # 提前停止读取时内容哈希不完整，只记录 ETag / Last-Modified
+            if validators is not None:
+                validators.set(store, key, etag, last_modified, hasher.hexdigest() if completed else None)
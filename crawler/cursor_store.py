@@ -0,0 +1,117 @@
+# cursor_store.py
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config import Config
+from crawler.local_store import SqliteKVStore
+
+
+class SourceCursor:
+    """
+    单个新闻源的高水位标记：最大排序键（如 ctime）和最近处理过的 id。
+    用于只请求增量数据，并在任何归一化处理之前丢弃已处理的条目。
+
+    filter_new() 只记录待提交的高水位，条目处理完成后调用 commit() 才推进并保存；
+    处理失败时不提交，下次抓取会重新得到这些条目。
+    """
+
+    def __init__(self, name: str, store: SqliteKVStore):
+        self.name = name
+        self.store = store
+        state = store.get(name) or {}
+        self.last_key: Any = state.get('last_key')
+        self.recent_ids = deque(state.get('recent_ids', []), maxlen=Config.CURSOR_RECENT_IDS)
+        self._id_set = set(self.recent_ids)
+        # 待提交的 id（保持顺序）、排序键和提交时的回调
+        self._pending_ids: Dict[Any, None] = {}
+        self._pending_key: Any = None
+        self._on_commit: List[Callable[[], None]] = []
+
+    def filter_new(self,
+                   items: Iterable[Any],
+                   id_key: Callable[[Any], Any],
+                   sort_key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """
+        过滤出未处理过的原始条目，并记录待提交的高水位（不修改已提交的状态）。
+
+        条目的 id 在最近处理过的 id 中，或排序键小于高水位时视为已处理。
+        """
+        new_items = []
+        for item in items:
+            item_id = id_key(item)
+            if item_id is None or item_id in self._id_set:
+                continue
+            key = sort_key(item) if sort_key else None
+            if key is not None and self.last_key is not None and key < self.last_key:
+                continue
+            new_items.append(item)
+            self._pending_ids[item_id] = None
+            if key is not None and (self._pending_key is None or key > self._pending_key):
+                self._pending_key = key
+        return new_items
+
+    def defer(self, callback: Callable[[], None]) -> None:
+        """登记在 commit() 时执行的回调（如保存 HTTP 校验信息）"""
+        self._on_commit.append(callback)
+
+    def commit(self) -> None:
+        """条目处理完成后推进高水位并保存"""
+        if self._pending_ids:
+            for item_id in self._pending_ids:
+                self._remember(item_id)
+            if self._pending_key is not None and (self.last_key is None or self._pending_key > self.last_key):
+                self.last_key = self._pending_key
+            self.save()
+        self._pending_ids = {}
+        self._pending_key = None
+        callbacks, self._on_commit = self._on_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self) -> None:
+        """丢弃待提交的高水位和回调（本轮结果被丢弃时调用），下次抓取会重新得到这些条目"""
+        self._pending_ids = {}
+        self._pending_key = None
+        self._on_commit = []
+
+    def _remember(self, item_id: Any) -> None:
+        if len(self.recent_ids) == self.recent_ids.maxlen:
+            self._id_set.discard(self.recent_ids[0])
+        self.recent_ids.append(item_id)
+        self._id_set.add(item_id)
+
+    def save(self) -> None:
+        self.store.set(self.name, {'last_key': self.last_key, 'recent_ids': list(self.recent_ids)})
+
+
+_store: Optional[SqliteKVStore] = None
+_cursors: Dict[str, SourceCursor] = {}
+
+
+def get_source_cursor(name: str) -> SourceCursor:
+    """
+    获取（或加载）指定新闻源的高水位标记。
+
+    name 使用网关中的源名称；一个源需要多个标记时用 "源名称:子键"（如 "mkt:policy"），
+    以便 rollback_source_cursors 按源丢弃。没有增量 id 的源也通过 defer() 登记校验信息的保存。
+    """
+    global _store
+    cursor = _cursors.get(name)
+    if cursor is None:
+        if _store is None:
+            _store = SqliteKVStore('source_cursors')
+        cursor = _cursors[name] = SourceCursor(name, _store)
+    return cursor
+
+
+def commit_source_cursors() -> None:
+    """提交所有新闻源的待提交高水位，在本轮抓取的条目处理完成后调用"""
+    for cursor in _cursors.values():
+        cursor.commit()
+
+
+def rollback_source_cursors(source: Optional[str] = None) -> None:
+    """丢弃指定源（含 "源名称:子键" 形式的标记）的待提交状态；source 为 None 时丢弃全部"""
+    for name, cursor in _cursors.items():
+        if source is None or name == source or name.startswith(source + ':'):
+            cursor.rollback()
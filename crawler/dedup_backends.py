@@ -0,0 +1,185 @@
+# dedup_backends.py
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from config import Config
+from crawler.local_store import state_path
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def member_hash(key: str) -> bytes:
+    """定长 8 字节哈希代替完整 URL 存储"""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+
+
+class DedupUnavailableError(Exception):
+    """去重存储不可用（连接失败、超时、数据库被锁等）"""
+
+
+class DedupBackend:
+    """
+    去重存储后端接口。所有后端提供相同的保留期语义：键在记录后
+    expire_days 天内视为已存在，之后自动失效。
+    """
+
+    def __init__(self, expire_days: int):
+        self.expire_days = expire_days
+
+    def check_and_add_many(self, keys: List[str]) -> List[bool]:
+        """原子地检查并记录一批键，返回与 keys 对应的列表，True 表示新键"""
+        raise NotImplementedError
+
+    def contains(self, key: str) -> bool:
+        """只读检查键是否存在"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+# KEYS: 所有存活的每日桶（KEYS[1] 为今天）；ARGV[1]: 今日桶过期秒数；ARGV[2..]: 成员哈希
+# 返回与成员一一对应的数组，1 表示新成员（已写入今日桶），0 表示已存在
+CHECK_AND_ADD_SCRIPT = """
+local result = {}
+for i = 2, #ARGV do
+    local seen = 0
+    for j = 1, #KEYS do
+        if redis.call('SISMEMBER', KEYS[j], ARGV[i]) == 1 then
+            seen = 1
+            break
+        end
+    end
+    if seen == 0 then
+        redis.call('SADD', KEYS[1], ARGV[i])
+    end
+    result[#result + 1] = 1 - seen
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return result
+"""
+
+
+class RedisDedupBackend(DedupBackend):
+    """
+    Redis 后端：按天分桶，每个桶是一个带过期时间的 set，过期数据由 Redis
+    自动删除，无需清理。检查和记录由服务端脚本在一次往返中原子完成。
+    """
+
+    def __init__(self, expire_days: int, redis_conn=None):
+        super().__init__(expire_days)
+        import redis
+        from crawler.redis_pool import get_redis_conn
+        self._errors = (redis.ConnectionError, redis.TimeoutError)
+        self.redis = redis_conn or get_redis_conn()
+        # 花括号为 Redis Cluster 的 hash tag，保证所有桶在同一个 slot，可以在脚本中一起访问
+        self.key_prefix = '{rss_seen}:'
+        self.check_and_add = self.redis.register_script(CHECK_AND_ADD_SCRIPT)
+
+    def _bucket_keys(self, now: Optional[float] = None) -> List[str]:
+        """当前存活的每日桶，今天的桶在最前"""
+        today = int((now or time.time()) // DAY_SECONDS)
+        return [f"{self.key_prefix}{day}" for day in range(today, today - self.expire_days - 1, -1)]
+
+    def check_and_add_many(self, keys):
+        try:
+            results = self.check_and_add(
+                keys=self._bucket_keys(),
+                args=[(self.expire_days + 1) * DAY_SECONDS] + [member_hash(key) for key in keys],
+            )
+        except self._errors as e:
+            raise DedupUnavailableError(str(e)) from e
+        return [added == 1 for added in results]
+
+    def contains(self, key):
+        try:
+            member = member_hash(key)
+            pipe = self.redis.pipeline(transaction=False)
+            for bucket in self._bucket_keys():
+                pipe.sismember(bucket, member)
+            return any(pipe.execute())
+        except self._errors as e:
+            raise DedupUnavailableError(str(e)) from e
+
+
+class SQLiteDedupBackend(DedupBackend):
+    """
+    嵌入式 SQLite（WAL）后端，适用于单机和离线部署，无需外部服务。
+
+    每个键保存一行（8 字节哈希 + 记录时间）。过期的行视为不存在，再次出现时
+    直接覆盖；过期数据按小时批量清理，不在每次检查时删除。
+    写事务使用 BEGIN IMMEDIATE，多个进程共用同一个数据库文件时检查和记录仍是原子的。
+    """
+
+    PURGE_INTERVAL = 60 * 60
+
+    def __init__(self, expire_days: int, path: Optional[str] = None):
+        super().__init__(expire_days)
+        self.path = path or state_path(Config.DEDUP_SQLITE_DB)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (member BLOB PRIMARY KEY, ts INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_ts ON seen (ts)")
+        self._purged_at = 0.0
+
+    def _cutoff(self, now: float) -> int:
+        return int(now) - self.expire_days * DAY_SECONDS
+
+    def check_and_add_many(self, keys):
+        now = time.time()
+        cutoff = self._cutoff(now)
+        results = []
+        try:
+            with self._lock:
+                self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for key in keys:
+                        before = self.conn.total_changes
+                        # 不存在时插入；已存在但已过期时覆盖时间，两种情况都算新键
+                        self.conn.execute(
+                            "INSERT INTO seen (member, ts) VALUES (?, ?) "
+                            "ON CONFLICT (member) DO UPDATE SET ts = excluded.ts WHERE seen.ts < ?",
+                            (member_hash(key), int(now), cutoff),
+                        )
+                        results.append(self.conn.total_changes > before)
+                    self.conn.execute("COMMIT")
+                except BaseException:
+                    self.conn.execute("ROLLBACK")
+                    raise
+                if now - self._purged_at > self.PURGE_INTERVAL:
+                    self.conn.execute("DELETE FROM seen WHERE ts < ?", (cutoff,))
+                    self._purged_at = now
+        except sqlite3.OperationalError as e:
+            raise DedupUnavailableError(str(e)) from e
+        return results
+
+    def contains(self, key):
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT 1 FROM seen WHERE member = ? AND ts >= ?",
+                    (member_hash(key), self._cutoff(time.time())),
+                ).fetchone()
+        except sqlite3.OperationalError as e:
+            raise DedupUnavailableError(str(e)) from e
+        return row is not None
+
+    def close(self):
+        self.conn.close()
+
+
+def create_dedup_backend(name: Optional[str] = None, expire_days: int = 30) -> DedupBackend:
+    """按名称（默认 Config.DEDUP_BACKEND）创建去重后端：redis / sqlite"""
+    name = name or Config.DEDUP_BACKEND
+    if name == 'redis':
+        return RedisDedupBackend(expire_days)
+    if name == 'sqlite':
+        return SQLiteDedupBackend(expire_days)
+    raise ValueError(f"未知的去重后端: {name}")
@@ -0,0 +1,101 @@
+# dedup_cache.py
+import hashlib
+import math
+import time
+from typing import Dict
+
+from crawler.ttl_cache import TTLCache
+
+
+class DecayingBloomFilter:
+    """
+    按时间衰减的布隆过滤器：两代位图轮换，每代覆盖 window 秒，
+    因此只记住最近 window ~ 2*window 秒内加入的键。
+    """
+
+    def __init__(self, capacity: int, error_rate: float, window: float):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.window = window
+        self.current = bytearray((self.num_bits + 7) // 8)
+        self.previous = bytearray((self.num_bits + 7) // 8)
+        self.rotated_at = time.monotonic()
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _maybe_rotate(self) -> None:
+        if time.monotonic() - self.rotated_at >= self.window:
+            self.previous = self.current
+            self.current = bytearray(len(self.previous))
+            self.rotated_at = time.monotonic()
+
+    def add(self, key: str) -> None:
+        self._maybe_rotate()
+        for pos in self._positions(key):
+            self.current[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        self._maybe_rotate()
+        positions = self._positions(key)
+        for bits in (self.current, self.previous):
+            if all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions):
+                return True
+        return False
+
+
+class LocalDedupCache:
+    """
+    去重的进程内前置缓存：最近键的 LRU + 衰减布隆过滤器。
+
+    - LRU 命中：确定已处理，不访问存储后端
+    - 布隆过滤器未命中：本进程确定没见过（仍需到存储后端原子登记，以免与其他爬虫重复处理）
+    - 其余情况不确定，交给存储后端判断
+    存储后端不可用时退化为只用本地结果判断。
+    """
+
+    def __init__(self, lru_size: int, bloom_capacity: int, bloom_error_rate: float, bloom_window: float):
+        self.lru = TTLCache(maxsize=lru_size)
+        self.bloom = DecayingBloomFilter(bloom_capacity, bloom_error_rate, bloom_window)
+        self.lookups = 0
+        self.bloom_negatives = 0
+        self.backend_checks = 0
+        self.backend_errors = 0
+        self.fallback_answers = 0
+
+    def seen_recently(self, key: str) -> bool:
+        """LRU 中存在即确定已处理"""
+        self.lookups += 1
+        return self.lru.get(key) is not None
+
+    def definitely_new(self, key: str) -> bool:
+        if key in self.bloom:
+            return False
+        self.bloom_negatives += 1
+        return True
+
+    def remember(self, key: str) -> None:
+        self.lru.set(key, True)
+        self.bloom.add(key)
+
+    def fallback_is_new(self, key: str) -> bool:
+        """存储后端不可用时的本地判断：布隆过滤器未命中即视为新条目"""
+        self.fallback_answers += 1
+        is_new = key not in self.bloom
+        self.remember(key)
+        return is_new
+
+    def stats(self) -> Dict:
+        return {
+            'lookups': self.lookups,
+            'lru_hits': self.lru.hits,
+            'lru_hit_rate': self.lru.hits / self.lookups if self.lookups else 0.0,
+            'lru_size': len(self.lru),
+            'bloom_negatives': self.bloom_negatives,
+            'backend_checks': self.backend_checks,
+            'backend_errors': self.backend_errors,
+            'fallback_answers': self.fallback_answers,
+        }
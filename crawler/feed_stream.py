@@ -0,0 +1,75 @@
+# feed_stream.py
+import xml.etree.ElementTree as ET
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Optional
+
+from crawler.async_news_fetcher import iter_url_chunks
+from crawler.http_cache import PendingValidators
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+ITEM_TAGS = ('item', 'entry')  # RSS 2.0 / RSS 1.0 的 item，Atom 的 entry
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _entry_from_element(elem: ET.Element) -> Dict[str, Optional[str]]:
+    """把 RSS item / Atom entry 元素转换为轻量 dict"""
+    entry = {'title': None, 'link': None, 'guid': None, 'description': None, 'pubDate': None}
+    for child in elem:
+        name = _local_name(child.tag)
+        text = (child.text or '').strip() or None
+        if name == 'title':
+            entry['title'] = text
+        elif name == 'link':
+            # Atom 的链接在 href 属性中，优先使用 rel="alternate"
+            href = child.get('href')
+            if href is None:
+                entry['link'] = entry['link'] or text
+            elif child.get('rel', 'alternate') == 'alternate' or entry['link'] is None:
+                entry['link'] = href
+        elif name in ('guid', 'id'):
+            entry['guid'] = text
+        elif name in ('description', 'summary'):
+            entry['description'] = entry['description'] or text
+        elif name in ('encoded', 'content'):
+            entry['description'] = text or entry['description']
+        elif name in ('pubDate', 'published', 'date'):
+            entry['pubDate'] = text
+        elif name == 'updated':
+            entry['pubDate'] = entry['pubDate'] or text
+    return entry
+
+
+async def iter_feed_entries(url: str,
+                            chunk_size: int = 16 * 1024,
+                            conditional: bool = True,
+                            validators: Optional[PendingValidators] = None) -> AsyncIterator[Dict[str, Optional[str]]]:
+    """
+    流式解析 RSS/Atom：按块读取响应体，每解析完一个条目就立即产出。
+    调用方提前停止迭代（用 aclosing 包裹）时不再读取剩余的响应体。
+
+    参数:
+        conditional: 是否使用条件请求，内容未变化（304）时不产出任何条目，也不抛出异常。
+        validators: 接收本次响应的校验信息，调用方处理完条目后再 commit()。
+
+    异常:
+        xml.etree.ElementTree.ParseError: XML 格式错误（如未定义的 HTML 实体）或文档不完整，
+        不会把截断的订阅源当作成功返回。
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    fed = False
+    async with aclosing(iter_url_chunks(url, chunk_size, conditional=conditional, validators=validators)) as chunks:
+        async for chunk in chunks:
+            fed = fed or bool(chunk)
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                if _local_name(elem.tag) not in ITEM_TAGS:
+                    continue
+                entry = _entry_from_element(elem)
+                elem.clear()  # 释放已产出条目的子元素
+                yield entry
+    # 304 时没有响应体，不能 close()（空文档会报 no element found）
+    if fed:
+        parser.close()
@@ -0,0 +1,152 @@
+# host_guard.py
+import asyncio
+import logging
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态，请求被直接拒绝"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"circuit open for {host}, retry after {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """令牌桶限流：rate 为每秒补充的令牌数，burst 为桶容量"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.throttled = 0  # 因令牌不足而等待的次数
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """获取一个令牌，令牌不足时等待补充"""
+        waited = False
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            if not waited:
+                self.throttled += 1
+                waited = True
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """熔断器：closed -> open（连续失败达到阈值）-> half_open（冷却后放行探测请求）"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, host: str, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failures = 0  # 连续失败次数
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.rejected = 0  # 被熔断拒绝的请求数
+
+    def before_request(self) -> None:
+        """请求前检查，熔断打开时抛出 CircuitOpenError"""
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.recovery_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, self.recovery_timeout - elapsed)
+            self.state = self.HALF_OPEN
+            self.half_open_calls = 0
+            logger.info(f"熔断器半开，开始探测: {self.host}")
+
+        if self.state == self.HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, 0.0)
+            self.half_open_calls += 1
+
+    def release_probe(self) -> None:
+        """请求被取消或因非网络异常中止、没有结果时归还半开探测名额"""
+        if self.state == self.HALF_OPEN and self.half_open_calls > 0:
+            self.half_open_calls -= 1
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"熔断器关闭，主机恢复: {self.host}")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"熔断器打开: {self.host}, 连续失败 {self.failures} 次")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class HostGuard:
+    """单个主机的限流器与熔断器"""
+
+    def __init__(self, host: str):
+        limits = Config.HOST_RATE_LIMITS.get(host, Config.DEFAULT_HOST_RATE_LIMIT)
+        self.host = host
+        self.bucket = TokenBucket(limits['rate'], limits['burst'])
+        self.breaker = CircuitBreaker(
+            host,
+            Config.CIRCUIT_FAILURE_THRESHOLD,
+            Config.CIRCUIT_RECOVERY_TIMEOUT,
+            Config.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        )
+
+    async def acquire(self) -> None:
+        """先检查熔断（快速失败），再获取限流令牌"""
+        self.breaker.before_request()
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+
+    def status(self) -> Dict:
+        return {
+            'state': self.breaker.state,
+            'failures': self.breaker.failures,
+            'rejected': self.breaker.rejected,
+            'throttled': self.bucket.throttled,
+        }
+
+
+_guards: Dict[str, HostGuard] = {}
+
+
+def get_host_guard(url: str) -> HostGuard:
+    """按 URL 的主机名获取（或创建）对应的 HostGuard"""
+    host = urlsplit(url).hostname or ''
+    guard = _guards.get(host)
+    if guard is None:
+        guard = _guards[host] = HostGuard(host)
+    return guard
+
+
+def get_host_guard_status() -> Dict[str, Dict]:
+    """查询所有主机的熔断状态和拒绝/限流计数"""
+    return {host: guard.status() for host, guard in _guards.items()}
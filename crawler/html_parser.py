@@ -0,0 +1,155 @@
+# html_parser.py
+import asyncio
+import importlib.util
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from config import Config
+
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+
+class Node:
+    """HTML 节点的统一接口，屏蔽不同解析后端的差异"""
+
+    def css(self, selector: str) -> List['Node']:
+        raise NotImplementedError
+
+    def css_first(self, selector: str) -> Optional['Node']:
+        nodes = self.css(selector)
+        return nodes[0] if nodes else None
+
+    def attr(self, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def text(self, strip: bool = False) -> str:
+        raise NotImplementedError
+
+
+class SelectolaxNode(Node):
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def css(self, selector):
+        return [SelectolaxNode(n) for n in self._node.css(selector)]
+
+    def css_first(self, selector):
+        n = self._node.css_first(selector)
+        return SelectolaxNode(n) if n is not None else None
+
+    def attr(self, name):
+        return self._node.attributes.get(name)
+
+    def text(self, strip=False):
+        return self._node.text(deep=True, strip=strip)
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(selector: str):
+    # CSS 选择器编译为 XPath 的开销远大于执行，缓存编译结果
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(selector)
+
+
+class LxmlNode(Node):
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def css(self, selector):
+        return [LxmlNode(n) for n in _lxml_selector(selector)(self._node)]
+
+    def attr(self, name):
+        return self._node.get(name)
+
+    def text(self, strip=False):
+        text = self._node.text_content()
+        return text.strip() if strip else text
+
+
+class Bs4Node(Node):
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    def css(self, selector):
+        return [Bs4Node(n) for n in self._node.select(selector)]
+
+    def css_first(self, selector):
+        n = self._node.select_one(selector)
+        return Bs4Node(n) if n is not None else None
+
+    def attr(self, name):
+        value = self._node.get(name)
+        # bs4 把 class 等多值属性解析为列表
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def text(self, strip=False):
+        return self._node.get_text(strip=strip)
+
+
+def available_backends() -> List[str]:
+    modules = {'selectolax': 'selectolax', 'lxml': 'lxml', 'bs4': 'bs4'}
+    return [name for name in BACKENDS if importlib.util.find_spec(modules[name]) is not None]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """解析后端名称，auto 时按 selectolax > lxml > bs4 选择已安装的后端"""
+    backend = backend or Config.HTML_PARSER_BACKEND
+    if backend != 'auto':
+        return backend
+    available = available_backends()
+    if not available:
+        raise RuntimeError("没有可用的 HTML 解析后端，请安装 selectolax、lxml 或 beautifulsoup4")
+    return available[0]
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> Node:
+    """用指定（或配置的）后端解析 HTML，返回根节点"""
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        return SelectolaxNode(LexborHTMLParser(html).root)
+    if backend == 'lxml':
+        import lxml.html
+        return LxmlNode(lxml.html.fromstring(html))
+    if backend == 'bs4':
+        from bs4 import BeautifulSoup
+        return Bs4Node(BeautifulSoup(html, "html.parser"))
+    raise ValueError(f"未知的 HTML 解析后端: {backend}")
+
+
+_pool: Optional[Executor] = None
+
+
+def get_parser_pool() -> Executor:
+    """获取全局解析工作池（进程池或线程池，由 Config.HTML_PARSER_POOL 决定）"""
+    global _pool
+    if _pool is None:
+        if Config.HTML_PARSER_POOL == 'process':
+            # 主进程已有调度器、模型预热等线程，fork 可能让子进程死锁在被复制的锁上，改用 spawn
+            _pool = ProcessPoolExecutor(max_workers=Config.HTML_PARSER_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        else:
+            _pool = ThreadPoolExecutor(max_workers=Config.HTML_PARSER_WORKERS,
+                                       thread_name_prefix='html-parser')
+    return _pool
+
+
+async def parse_in_worker(func: Callable, *args):
+    """在解析工作池中运行 CPU 密集型解析函数，避免阻塞事件循环"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parser_pool(), func, *args)
+
+
+def shutdown_parser_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
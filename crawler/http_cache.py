@@ -0,0 +1,87 @@
+# http_cache.py
+import hashlib
+from typing import Dict, Optional
+
+from crawler.local_store import SqliteKVStore
+
+
+def new_content_hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+def content_hash(body: bytes) -> str:
+    hasher = new_content_hasher()
+    hasher.update(body)
+    return hasher.hexdigest()
+
+
+class ValidatorStore:
+    """按 URL 持久化保存 HTTP 校验信息（ETag / Last-Modified / 内容哈希）"""
+
+    def __init__(self, kv: Optional[SqliteKVStore] = None):
+        self.kv = kv or SqliteKVStore('http_validators')
+        self._cache: Dict[str, Optional[Dict[str, str]]] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        if key not in self._cache:
+            self._cache[key] = self.kv.get(key)
+        return self._cache[key]
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """构造条件请求头 If-None-Match / If-Modified-Since"""
+        validators = self.get(key) or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def is_same_body(self, key: str, body_hash: str) -> bool:
+        validators = self.get(key)
+        return bool(validators) and validators.get('hash') == body_hash
+
+    def update(self, key: str, etag: Optional[str], last_modified: Optional[str], body_hash: Optional[str]) -> None:
+        validators = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'hash': body_hash,
+        }
+        if self._cache.get(key) == validators:
+            return
+        self._cache[key] = validators
+        self.kv.set(key, validators)
+
+
+class PendingValidators:
+    """
+    一次响应的校验信息，调用方成功解析响应后调用 commit() 才保存。
+    解析失败时不保存，下次抓取不会误判为"未变化"而漏掉这批条目。
+    """
+
+    __slots__ = ('_pending',)
+
+    def __init__(self):
+        self._pending = None
+
+    def set(self, store: ValidatorStore, key: str, etag: Optional[str],
+            last_modified: Optional[str], body_hash: Optional[str]) -> None:
+        self._pending = (store, key, etag, last_modified, body_hash)
+
+    def commit(self) -> None:
+        if self._pending is None:
+            return
+        store, key, etag, last_modified, body_hash = self._pending
+        store.update(key, etag, last_modified, body_hash)
+        self._pending = None
+
+
+_validator_store: Optional[ValidatorStore] = None
+
+
+def get_validator_store() -> ValidatorStore:
+    """获取全局校验信息存储"""
+    global _validator_store
+    if _validator_store is None:
+        _validator_store = ValidatorStore()
+    return _validator_store
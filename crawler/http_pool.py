@@ -0,0 +1,62 @@
+# http_pool.py
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+from config import Config
+
+# 全局 aiohttp 会话，按事件循环绑定（aiohttp 的连接器不能跨事件循环复用）
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """创建带连接池、keep-alive 和 DNS 缓存的会话"""
+    connector = aiohttp.TCPConnector(
+        limit=Config.HTTP_POOL_LIMIT,  # 总连接数上限
+        limit_per_host=Config.HTTP_POOL_LIMIT_PER_HOST,  # 每个主机的连接数上限
+        ttl_dns_cache=Config.HTTP_DNS_CACHE_TTL,  # DNS 缓存时间（秒）
+        keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,  # 空闲连接保活时间（秒）
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT),
+        # 各新闻源共用会话，不自动保存 cookies，避免不同源之间互相影响
+        cookie_jar=aiohttp.DummyCookieJar(),
+    )
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """获取当前事件循环下的全局会话，不存在或已关闭时重新创建"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is not None and not _session.closed and _session_loop is loop:
+        return _session
+    if _session is not None and not _session.closed and _session_loop is not None and not _session_loop.is_closed():
+        # 旧事件循环仍然存活时，交给它去关闭旧会话
+        asyncio.run_coroutine_threadsafe(_session.close(), _session_loop)
+    _session = _create_session()
+    _session_loop = loop
+    return _session
+
+
+async def close_http_session() -> None:
+    """关闭全局会话，释放所有连接（进程退出或事件循环结束前调用）"""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def run_with_session(coro):
+    """在新事件循环中运行协程，结束时关闭该循环上的全局会话"""
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            await close_http_session()
+
+    return asyncio.run(_runner())
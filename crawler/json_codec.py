@@ -0,0 +1,58 @@
+# json_codec.py
+import json
+from typing import Any, Dict, Optional
+
+from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _resolve_backend() -> str:
+    backend = Config.JSON_BACKEND
+    if backend != 'auto':
+        return backend
+    if orjson is not None:
+        return 'orjson'
+    if msgspec is not None:
+        return 'msgspec'
+    return 'json'
+
+
+_backend = _resolve_backend()
+_decoders: Dict[Any, Any] = {}
+
+
+def loads(data):
+    """用配置的（或最快的已安装）JSON 库解码 bytes / str"""
+    if _backend == 'orjson':
+        return orjson.loads(data)
+    if _backend == 'msgspec':
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def decode(data, schema: Optional[Any] = None):
+    """
+    解码 JSON。提供 schema（crawler.json_schemas 中的类型）且安装了 msgspec 时，
+    按类型解码，只构造 schema 中声明的字段，再转换为 dict/list。
+    值为 null 的字段保留为 None，schema 中声明但 JSON 中缺失的字段同样输出为 None
+    （键总是存在），调用方应使用 d.get(key) or 默认值，而不是 d.get(key, 默认值)。
+    数据与 schema 不符时退回普通解码。
+    """
+    if schema is None or msgspec is None:
+        return loads(data)
+    decoder = _decoders.get(schema)
+    if decoder is None:
+        decoder = _decoders[schema] = msgspec.json.Decoder(schema)
+    try:
+        return msgspec.to_builtins(decoder.decode(data))
+    except msgspec.ValidationError:
+        return loads(data)
@@ -0,0 +1,133 @@
+# json_schemas.py
+# 已知接口返回结构的类型定义（需要 msgspec），只声明各新闻源实际用到的字段；
+# 未安装 msgspec 时均为 None，json_codec.decode 退回普通解码
+from typing import Any, List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    # 不使用 omit_defaults：值为 null 或缺省的字段也要保留在输出 dict 中，
+    # 各新闻源会直接按键取值（如 k["shareurl"]）
+    class _Schema(msgspec.Struct):
+        pass
+
+    # 金十快讯 flash_newest.js
+    class Jin10FlashData(_Schema):
+        title: Optional[str] = None
+        content: Optional[str] = None
+
+    class Jin10Flash(_Schema):
+        id: Any = None
+        time: Optional[str] = None
+        important: Any = None
+        channel: Optional[List[Any]] = None
+        data: Optional[Jin10FlashData] = None
+
+    # mktnews api/flash/host
+    class MktFlashData(_Schema):
+        title: Optional[str] = None
+        content: Optional[str] = None
+
+    class MktFlash(_Schema):
+        id: Any = None
+        time: Optional[str] = None
+        data: Optional[MktFlashData] = None
+
+    class MktChild(_Schema):
+        flash_list: Optional[List[MktFlash]] = None
+
+    class MktCategory(_Schema):
+        name: Optional[str] = None
+        child: Optional[List[MktChild]] = None
+
+    class MktFlashHost(_Schema):
+        data: List[MktCategory]
+
+    # 华尔街见闻 lives / information-flow / hot
+    class WallstcnLive(_Schema):
+        id: Any = None
+        title: Optional[str] = None
+        content_text: Optional[str] = None
+        display_time: Optional[int] = None
+        uri: Optional[str] = None
+
+    class WallstcnLivesData(_Schema):
+        items: List[WallstcnLive] = []
+
+    class WallstcnLives(_Schema):
+        data: Optional[WallstcnLivesData] = None
+
+    class WallstcnResource(_Schema):
+        id: Any = None
+        type: Optional[str] = None
+        title: Optional[str] = None
+        content_short: Optional[str] = None
+        display_time: Optional[int] = None
+        uri: Optional[str] = None
+
+    class WallstcnFlowItem(_Schema):
+        resource_type: Optional[str] = None
+        resource: Optional[WallstcnResource] = None
+
+    class WallstcnFlowData(_Schema):
+        items: List[WallstcnFlowItem] = []
+
+    class WallstcnFlow(_Schema):
+        data: Optional[WallstcnFlowData] = None
+
+    class WallstcnHotItem(_Schema):
+        id: Any = None
+        title: Optional[str] = None
+        uri: Optional[str] = None
+
+    class WallstcnHotData(_Schema):
+        day_items: List[WallstcnHotItem] = []
+
+    class WallstcnHot(_Schema):
+        data: Optional[WallstcnHotData] = None
+
+    # 今日头条热榜
+    class ToutiaoLabelUri(_Schema):
+        url: Optional[str] = None
+
+    class ToutiaoHotEvent(_Schema):
+        ClusterIdStr: Optional[str] = None
+        Title: Optional[str] = None
+        LabelUri: Optional[ToutiaoLabelUri] = None
+
+    class ToutiaoHotBoard(_Schema):
+        data: List[ToutiaoHotEvent] = []
+
+    # 财联社电报 updateTelegraphList
+    class ClsRoll(_Schema):
+        id: Any = None
+        title: Optional[str] = None
+        brief: Optional[str] = None
+        shareurl: Optional[str] = None
+        ctime: Optional[int] = None
+        is_ad: Any = None
+
+    class ClsRollData(_Schema):
+        roll_data: List[ClsRoll]
+
+    class ClsTelegraph(_Schema):
+        data: ClsRollData
+
+    JIN10_FLASH = List[Jin10Flash]
+    MKT_FLASH_HOST = MktFlashHost
+    WALLSTCN_LIVES = WallstcnLives
+    WALLSTCN_FLOW = WallstcnFlow
+    WALLSTCN_HOT = WallstcnHot
+    TOUTIAO_HOT_BOARD = ToutiaoHotBoard
+    CLS_TELEGRAPH = ClsTelegraph
+else:
+    JIN10_FLASH = None
+    MKT_FLASH_HOST = None
+    WALLSTCN_LIVES = None
+    WALLSTCN_FLOW = None
+    WALLSTCN_HOT = None
+    TOUTIAO_HOT_BOARD = None
+    CLS_TELEGRAPH = None
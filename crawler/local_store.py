@@ -0,0 +1,72 @@
+# local_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator, Optional, Tuple
+
+from config import Config
+
+
+def state_path(filename: str) -> str:
+    """返回本地状态文件路径，必要时创建 Config.STATE_DIR 目录"""
+    os.makedirs(Config.STATE_DIR, exist_ok=True)
+    return os.path.join(Config.STATE_DIR, filename)
+
+
+class SqliteKVStore:
+    """基于 SQLite（WAL 模式）的持久化键值存储，值以 JSON 保存"""
+
+    def __init__(self, table: str, path: Optional[str] = None):
+        self.table = table
+        self.path = path or state_path(Config.CRAWLER_STATE_DB)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """读取键值，max_age（秒）不为空时忽略过期数据"""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT value, updated_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if max_age is not None and time.time() - row[1] > max_age:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, data, time.time()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(f"SELECT key, value FROM {self.table}").fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def purge_older_than(self, max_age: float) -> int:
+        """删除超过 max_age（秒）未更新的数据，返回删除条数"""
+        with self._lock:
+            cursor = self.conn.execute(
+                f"DELETE FROM {self.table} WHERE updated_at < ?", (time.time() - max_age,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        self.conn.close()
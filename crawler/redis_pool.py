@@ -1,11 +1,13 @@
 # redis_pool.py
 import redis
 
+from config import Config
+
 # 全局 Redis 连接池
 redis_pool = redis.ConnectionPool(
-    host='100.107.167.15',
-    port=6379,
-    db=0,
+    host=Config.REDIS_HOST,
+    port=Config.REDIS_PORT,
+    db=Config.REDIS_DB,
     decode_responses=True,
     max_connections=100  # 最大连接数
 )
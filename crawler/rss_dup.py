@@ -1,42 +1,122 @@
-import redis
-import time
+import asyncio
+import logging
+from typing import Optional
 
-from crawler.redis_pool import get_redis_conn
+from config import Config
+from crawler.dedup_backends import DedupUnavailableError, create_dedup_backend
+from crawler.dedup_cache import LocalDedupCache
+from models.news_item import NewsItem
+
+logger = logging.getLogger(__name__)
+
+
+def item_key(item):
+    """
+    条目的去重键：NewsItem 使用 dedup_key；原始 dict 与 dedup_key 的优先级一致，
+    先用链接，没有链接时才用 guid。流式解析和记录去重都应先归一化为 NewsItem。
+    """
+    if isinstance(item, NewsItem):
+        return item.dedup_key
+    return item.get('link') or item.get('url') or item.get('guid')
 
 
 class RSSDeduplicator:
-    def __init__(self):
-        self.redis = get_redis_conn()
+    def __init__(self, backend=None):
         self.expire_days = 30
-        self.key_name = 'rss_seen_set'
-        # 设置清理频率（每处理多少条记录后清理一次）
-        self.cleanup_frequency = 100
-        self.counter = 0
+        # 存储后端由 Config.DEDUP_BACKEND 选择（redis / sqlite）
+        self.backend = backend or create_dedup_backend(expire_days=self.expire_days)
+        # 进程内前置缓存，大部分重复条目无需访问存储后端
+        self.local = LocalDedupCache(
+            Config.DEDUP_LRU_SIZE,
+            Config.DEDUP_BLOOM_CAPACITY,
+            Config.DEDUP_BLOOM_ERROR_RATE,
+            Config.DEDUP_BLOOM_WINDOW,
+        )
 
     def is_duplicate(self, item):
-        key = item.get('guid') or item.get('link')
+        return not self.is_duplicate_many([item])[0]
+
+    def is_duplicate_many(self, items):
+        """
+        批量检查并记录条目。
+
+        先查进程内缓存，最近见过的条目直接判定为重复；其余条目交给存储后端
+        一次性原子地检查并记录：多个爬虫并发处理同一条目时只有一个会得到
+        "新条目"。批次内重复的条目只有第一个算新条目。
+        存储后端不可用时退化为进程内判断，不抛出异常。
+
+        返回:
+            list[bool]: 与 items 一一对应，True 表示新条目（需要处理）。
+        """
+        mask = [True] * len(items)  # 没有 guid/link 的条目不去重
+        pending = []
+        batch_keys = set()
+        for i, item in enumerate(items):
+            key = item_key(item)
+            if not key:
+                continue
+            if key in batch_keys or self.local.seen_recently(key):
+                mask[i] = False
+                continue
+            batch_keys.add(key)
+            self.local.definitely_new(key)  # 统计本进程确定没见过的比例，用于评估 LRU 容量
+            pending.append((i, key))
+        if not pending:
+            return mask
+
+        try:
+            results = self.backend.check_and_add_many([key for _, key in pending])
+            self.local.backend_checks += len(pending)
+        except DedupUnavailableError as e:
+            self.local.backend_errors += 1
+            logger.warning(f"去重存储不可用，使用进程内去重: {e}")
+            for i, key in pending:
+                mask[i] = self.local.fallback_is_new(key)
+            return mask
+
+        for (i, key), is_new in zip(pending, results):
+            mask[i] = is_new
+            self.local.remember(key)
+        return mask
+
+    def stats(self):
+        """进程内前置缓存的命中率等统计，用于评估缓存容量"""
+        return self.local.stats()
+
+    def is_seen(self, item):
+        """只读检查条目是否已处理过，不记录（用于流式解析时提前停止）"""
+        key = item_key(item)
         if not key:
             return False
+        if self.local.seen_recently(key):
+            return True
+        return self._backend_contains(key)
 
-        # 定期清理（每处理cleanup_frequency条记录后清理一次）
-        self.counter += 1
-        if self.counter >= self.cleanup_frequency:
-            self.cleanup_old_data()
-            self.counter = 0
-
-        # 检查是否存在
-        if self.redis.zscore(self.key_name, key) is not None:
+    async def is_seen_async(self, item):
+        """is_seen 的异步版本：进程内缓存未命中时在线程中查询存储后端，不阻塞事件循环"""
+        key = item_key(item)
+        if not key:
+            return False
+        if self.local.seen_recently(key):
             return True
+        return await asyncio.to_thread(self._backend_contains, key)
+
+    def _backend_contains(self, key):
+        try:
+            return self.backend.contains(key)
+        except DedupUnavailableError:
+            return key in self.local.bloom
+
 
-        # 添加新数据，使用当前时间作为分数
-        self.redis.zadd(self.key_name, {key: time.time()})
-        return False
+_deduplicator: Optional[RSSDeduplicator] = None
 
-    def cleanup_old_data(self):
-        # 计算一个月前的时间戳
-        cutoff_time = time.time() - (self.expire_days * 24 * 60 * 60)
-        # 删除分数(时间戳)小于cutoff_time的所有成员
-        self.redis.zremrangebyscore(self.key_name, 0, cutoff_time)
+
+def get_rss_deduplicator() -> RSSDeduplicator:
+    """获取全局 RSS 去重器（首次调用时连接存储后端）"""
+    global _deduplicator
+    if _deduplicator is None:
+        _deduplicator = RSSDeduplicator()
+    return _deduplicator
 
 if __name__ == "__main__":
     rss_items = [
@@ -50,11 +130,7 @@ if __name__ == "__main__":
     def process(items):
         print("Processing:", items)
 
-    try:
-        dedup = RSSDeduplicator()
-        for it in rss_items:
-            if dedup.is_duplicate(it):
-                continue
-            process(it)
-    except* (redis.ConnectionError, redis.TimeoutError) as eg:
-        print(f"Redis连接问题: {eg}")
\ No newline at end of file
+    dedup = RSSDeduplicator()
+    new_items = [it for it, is_new in zip(rss_items, dedup.is_duplicate_many(rss_items)) if is_new]
+    process(new_items)
+    print(dedup.stats())
\ No newline at end of file
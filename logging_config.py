@@ -4,13 +4,22 @@ import os
 from config import config
 
 
+# 全局日志实例（根日志记录器）；导入本模块不会创建任何处理器
+logger = logging.getLogger()
+
+_configured = False
+
+
 def setup_logging():
-    """配置日志系统"""
+    """配置日志系统，由入口脚本调用；重复调用不会重复添加处理器"""
+    global _configured
+    if _configured:
+        return logger
+    _configured = True
+
     # 创建日志目录
     os.makedirs('logs', exist_ok=True)
 
-    # 创建根日志记录器
-    logger = logging.getLogger()
     logger.setLevel(getattr(logging, config.LOG_LEVEL))
 
     # 文件处理器 - 滚动日志
@@ -38,7 +47,3 @@ def setup_logging():
     logger.addHandler(console_handler)
 
     return logger
-
-
-# 全局日志实例
-logger = setup_logging()
\ No newline at end of file
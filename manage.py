@@ -4,12 +4,15 @@
 """
 
 import argparse
-from scheduler.task_scheduler import task_scheduler
-from logging_config import logger
+
+from logging_config import setup_logging
 
 
 def show_status():
     """显示系统状态"""
+    # 调度器依赖 apscheduler，只在需要时导入，保证命令行启动足够快
+    from scheduler.task_scheduler import task_scheduler
+
     status = task_scheduler.get_job_status()
     print("系统任务状态:")
     for job_id, info in status.items():
@@ -31,6 +34,7 @@ def main():
     run_parser.add_argument('task', choices=['main', 'quick'], help='任务类型')
 
     args = parser.parse_args()
+    setup_logging()
 
     if args.command == 'status':
         show_status()
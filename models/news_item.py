@@ -0,0 +1,134 @@
+# news_item.py
+import calendar
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+# 新闻源均为中文站点，不带时区的时间按北京时间处理
+SOURCE_TZ = timezone(timedelta(hours=8))
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """所有新闻源统一的紧凑条目模型，时间统一为毫秒时间戳"""
+    source: str
+    title: str
+    url: Optional[str] = None
+    id: Optional[str] = None
+    pub_ms: Optional[int] = None
+    description: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+    @property
+    def dedup_key(self) -> Optional[str]:
+        """去重键：优先使用链接，没有链接时使用 源名称:id"""
+        if self.url:
+            return self.url
+        if self.id:
+            return f"{self.source}:{self.id}"
+        return None
+
+    @property
+    def published_at(self) -> Optional[datetime]:
+        if self.pub_ms is None:
+            return None
+        return datetime.fromtimestamp(self.pub_ms / 1000, tz=timezone.utc)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为处理器和存储层使用的 dict"""
+        return {
+            'source': self.source,
+            'id': self.id,
+            'title': self.title,
+            'url': self.url,
+            'content': self.description or self.title,
+            'published_at': self.published_at,
+            'extra': self.extra,
+        }
+
+
+def to_epoch_ms(value: Any) -> Optional[int]:
+    """把各新闻源的时间表示统一转换为毫秒时间戳，无法识别时返回 None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, time.struct_time):
+        # feedparser 的 *_parsed 字段为 UTC struct_time
+        return calendar.timegm(value) * 1000
+    if isinstance(value, datetime):
+        dt = value if value.tzinfo else value.replace(tzinfo=SOURCE_TZ)
+        return int(dt.timestamp() * 1000)
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value.strip())
+    if isinstance(value, (int, float)):
+        # 大于 1e12 视为毫秒，否则视为秒
+        return int(value) if value > 1e12 else int(value * 1000)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return to_epoch_ms(datetime.fromisoformat(text.replace('Z', '+00:00')))
+        except ValueError:
+            pass
+        try:
+            return to_epoch_ms(parsedate_to_datetime(text))
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _description(raw: Dict[str, Any]) -> Optional[str]:
+    if raw.get('description'):
+        return raw['description']
+    if raw.get('summary'):
+        return raw['summary']
+    content = raw.get('content')
+    if isinstance(content, list) and content:
+        # feedparser 的 content 为列表
+        return content[0].get('value')
+    if isinstance(content, str):
+        return content
+    extra = raw.get('extra') or {}
+    return extra.get('hover')
+
+
+def _pub_ms(raw: Dict[str, Any]) -> Optional[int]:
+    for key in ('pubDate', 'published_parsed', 'updated_parsed', 'published', 'updated', 'ctime'):
+        pub_ms = to_epoch_ms(raw.get(key))
+        if pub_ms is not None:
+            return pub_ms
+    extra = raw.get('extra') or {}
+    return to_epoch_ms(extra.get('date'))
+
+
+def normalize_item(source: str, raw: Any) -> Optional[NewsItem]:
+    """把新闻源返回的原始条目转换为 NewsItem，没有标题的条目返回 None"""
+    if isinstance(raw, NewsItem):
+        return raw
+    title = raw.get('title')
+    if not title:
+        return None
+    item_id = raw.get('id') or raw.get('guid')
+    extra = raw.get('extra')
+    if extra:
+        extra = {k: v for k, v in extra.items() if k != 'date' and v is not None} or None
+    return NewsItem(
+        source=sys.intern(source),
+        title=title,
+        url=raw.get('url') or raw.get('link'),
+        id=str(item_id) if item_id is not None else None,
+        pub_ms=_pub_ms(raw),
+        description=_description(raw),
+        extra=extra,
+    )
+
+
+def normalize_items(source: str, items: Iterable[Any]) -> List[NewsItem]:
+    """归一化一个新闻源的全部条目"""
+    result = []
+    for raw in items:
+        item = normalize_item(source, raw)
+        if item is not None:
+            result.append(item)
+    return result
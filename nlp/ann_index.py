@@ -0,0 +1,235 @@
+import json
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from nlp.embedding_buffer import l2_normalize
+
+
+class IVFFlatIndex:
+    """
+    磁盘持久化的 IVF-Flat 近似最近邻索引（纯 numpy，CPU 即可）。
+
+    - 向量、时间戳和所属倒排表存放在 np.memmap 文件中，重启后直接映射，无需重建；
+    - 槽位按环形顺序写入，容量满后覆盖最旧的条目；超过保留期的条目在查询时被忽略，
+      evict()（每日清理任务调用）会把它们真正清掉；
+    - memmap 的脏页由操作系统回写，add() 只更新元数据，每隔 flush_interval 秒
+      才显式 flush 一次；
+    - 向量数达到 nlist * train_factor 之前做暴力扫描，之后用球面 k-means 训练出
+      nlist 个中心，查询只扫描最近的 nprobe 个倒排表。
+    """
+
+    META_FILE = "meta.json"
+    CENTROIDS_FILE = "centroids.npy"
+
+    def __init__(self, path: str, dim: int, capacity: int = 300000, nlist: int = 256, nprobe: int = 8,
+                 dtype: str = "float16", retention_seconds: Optional[float] = None, train_factor: int = 32,
+                 model_name: str = "", flush_interval: float = 60.0):
+        self.path = path
+        self.dim = dim
+        self.model_name = model_name
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.dtype = np.dtype(dtype)
+        self.retention_seconds = retention_seconds
+        self.train_size = nlist * train_factor
+        os.makedirs(path, exist_ok=True)
+
+        meta = self._read_meta()
+        fresh = meta is None
+        mode = "w+" if fresh else "r+"
+        self.vectors = np.memmap(self._file("vectors.mmap"), dtype=self.dtype, mode=mode, shape=(capacity, dim))
+        # 时间戳为 0 表示空槽位；倒排表编号 -1 表示空槽位，-2 表示索引尚未训练
+        self.timestamps = np.memmap(self._file("timestamps.mmap"), dtype=np.float64, mode=mode, shape=(capacity,))
+        self.list_ids = np.memmap(self._file("lists.mmap"), dtype=np.int32, mode=mode, shape=(capacity,))
+        self.centroids: Optional[np.ndarray] = None
+
+        if fresh:
+            self.list_ids[:] = -1
+            self._next = 0
+            # 旧索引的聚类中心与新向量不匹配，必须一起删除
+            if os.path.exists(self._file(self.CENTROIDS_FILE)):
+                os.remove(self._file(self.CENTROIDS_FILE))
+        else:
+            self._next = meta["next"]
+            if os.path.exists(self._file(self.CENTROIDS_FILE)):
+                self.centroids = np.load(self._file(self.CENTROIDS_FILE))
+        self._size = int(np.count_nonzero(self.timestamps[:]))  # 非空槽位数，之后增量维护
+        self._last_flush = time.monotonic()
+        self._rebuild_lists()
+        if fresh:
+            self.flush()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _meta_header(self) -> dict:
+        return {
+            "model": self.model_name,
+            "dim": self.dim,
+            "capacity": self.capacity,
+            "nlist": self.nlist,
+            "dtype": self.dtype.name,
+        }
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._file(self.META_FILE)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # 模型/后端、维度、容量等变化时丢弃旧索引，避免混入不同模型的向量
+        header = self._meta_header()
+        return meta if {k: meta.get(k) for k in header} == header else None
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        """非空槽位数（含已过保留期但尚未 evict 的条目）"""
+        return self._size
+
+    def _cutoff(self, now: Optional[float] = None) -> float:
+        if not self.retention_seconds:
+            return 0.0
+        return (now or time.time()) - self.retention_seconds
+
+    def _rebuild_lists(self):
+        """从 list_ids 重建内存中的倒排表（槽位号数组）"""
+        list_ids = np.asarray(self.list_ids)
+        order = np.argsort(list_ids, kind="stable")
+        bounds = np.searchsorted(list_ids[order], np.arange(self.nlist + 1))
+        self._lists: List[List[np.ndarray]] = [
+            [order[bounds[i]:bounds[i + 1]]] for i in range(self.nlist)
+        ]
+
+    def _list_slots(self, list_id: int) -> np.ndarray:
+        chunks = self._lists[list_id]
+        # 环形覆盖后同一槽位可能再次分到同一个倒排表，合并时去重
+        slots = np.unique(np.concatenate(chunks)) if len(chunks) > 1 else chunks[0]
+        # 去掉已被覆盖（分到了别的倒排表）或已驱逐的槽位
+        slots = slots[self.list_ids[slots] == list_id]
+        self._lists[list_id] = [slots]
+        return slots
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def add(self, embeddings: np.ndarray, timestamps: Optional[np.ndarray] = None):
+        """批量写入嵌入（时间戳默认为当前时间），必要时触发训练"""
+        rows = l2_normalize(embeddings)[-self.capacity:]
+        n = len(rows)
+        if not n:
+            return
+        if timestamps is None:
+            timestamps = np.full(n, time.time())
+        slots = (self._next + np.arange(n)) % self.capacity
+
+        self._size += int(np.count_nonzero(self.timestamps[slots] == 0))
+        self.vectors[slots] = rows.astype(self.dtype)
+        self.timestamps[slots] = np.asarray(timestamps, dtype=np.float64)[-n:]
+        if self.trained:
+            list_ids = self._assign(rows)
+            self.list_ids[slots] = list_ids
+            for list_id in np.unique(list_ids):
+                self._lists[list_id].append(slots[list_ids == list_id])
+        else:
+            self.list_ids[slots] = -2
+        self._next = int((self._next + n) % self.capacity)
+
+        if not self.trained and self._size >= self.train_size:
+            self.train()
+        elif time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        else:
+            self._write_meta()
+
+    def train(self, iterations: int = 10, seed: int = 0):
+        """在现有向量上训练球面 k-means 中心并重新分配所有槽位"""
+        valid = np.flatnonzero(self.timestamps[:] > self._cutoff())
+        if len(valid) < self.nlist:
+            return
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(valid, size=min(len(valid), self.train_size), replace=False)
+        data = np.asarray(self.vectors[np.sort(sample)], dtype=np.float32)
+
+        centroids = data[rng.choice(len(data), size=self.nlist, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, data)
+            empty = ~sums.any(axis=1)
+            # 空簇用随机样本重新初始化
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+            centroids = l2_normalize(sums)
+        self.centroids = centroids
+
+        self.list_ids[:] = -1
+        for start in range(0, len(valid), 65536):
+            chunk = valid[start:start + 65536]
+            self.list_ids[chunk] = self._assign(np.asarray(self.vectors[chunk], dtype=np.float32))
+        np.save(self._file(self.CENTROIDS_FILE), centroids)
+        self._rebuild_lists()
+        self.flush()
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """清除超过保留期的条目，返回清除数量"""
+        expired = np.flatnonzero((self.timestamps[:] > 0) & (self.timestamps[:] <= self._cutoff(now)))
+        if len(expired):
+            self.timestamps[expired] = 0
+            self.list_ids[expired] = -1
+            self._size -= len(expired)
+            self.flush()
+        return len(expired)
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray:
+        if not self.trained:
+            return np.flatnonzero(self.list_ids[:] == -2)
+        probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        return np.concatenate([self._list_slots(i) for i in probes])
+
+    def search(self, queries: np.ndarray, k: int = 10, now: Optional[float] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        对每条查询返回 (相似度, 槽位) 两个数组，按相似度降序，最多 k 条。
+        只返回保留期内的条目。
+        """
+        queries = l2_normalize(queries)
+        cutoff = self._cutoff(now)
+        results = []
+        for query in queries:
+            slots = self._candidates(query)
+            slots = slots[self.timestamps[slots] > cutoff]
+            if not len(slots):
+                results.append((np.empty(0, dtype=np.float32), slots))
+                continue
+            sims = np.asarray(self.vectors[slots], dtype=np.float32) @ query
+            top = min(k, len(slots))
+            best = np.argpartition(-sims, top - 1)[:top]
+            best = best[np.argsort(-sims[best])]
+            results.append((sims[best], slots[best]))
+        return results
+
+    def surprise_scores(self, queries: np.ndarray, k: int = 10, now: Optional[float] = None) -> np.ndarray:
+        """1 - 与保留期内最相似 k 条的平均相似度；没有历史时为 1.0"""
+        return np.array(
+            [1.0 - float(sims.mean()) if len(sims) else 1.0 for sims, _ in self.search(queries, k, now)],
+            dtype=np.float32,
+        )
+
+    def flush(self):
+        self.vectors.flush()
+        self.timestamps.flush()
+        self.list_ids.flush()
+        self._last_flush = time.monotonic()
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp = self._file(self.META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({**self._meta_header(), "next": self._next}, f)
+        os.replace(tmp, self._file(self.META_FILE))
@@ -0,0 +1,159 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from config import Config
+
+BACKENDS = ('torch', 'onnx')
+
+
+class EmbeddingBackend:
+    """文本嵌入后端的统一接口（与 SentenceTransformer 的用法保持一致）"""
+
+    name = ''
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """返回 (len(texts), dim) 的 float32 归一化嵌入"""
+        raise NotImplementedError
+
+    def get_sentence_embedding_dimension(self) -> int:
+        raise NotImplementedError
+
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    """全精度 PyTorch SentenceTransformer"""
+
+    name = 'torch'
+
+    def __init__(self, model_name: str, threads: Optional[int] = None):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    def encode(self, texts, batch_size=32):
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+
+    def get_sentence_embedding_dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """
+    ONNX Runtime 上运行的 int8 动态量化模型（由 export_onnx_model 导出）。
+
+    bge 系列使用 [CLS] 向量作为句向量并做 L2 归一化，这里保持相同的池化方式。
+    """
+
+    name = 'onnx'
+
+    def __init__(self, model_dir: str, threads: Optional[int] = None, max_length: int = 512):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = os.path.join(model_dir, 'model_int8.onnx')
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"{model_path} 不存在，请先运行 python -m nlp.embedding_backends export")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_length = max_length
+        self._dim = self.session.get_outputs()[0].shape[-1]
+
+    def encode(self, texts, batch_size=32):
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='np',
+            )
+            feeds = {k: v.astype(np.int64) for k, v in inputs.items() if k in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+            chunks.append(hidden[:, 0])
+        embeddings = np.concatenate(chunks).astype(np.float32)
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def get_sentence_embedding_dimension(self):
+        return self._dim
+
+
+def export_onnx_model(model_name: str, output_dir: str, opset: int = 14) -> str:
+    """把 Hugging Face 模型导出为 ONNX，再做 int8 动态量化；返回量化模型路径"""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(output_dir)
+
+    sample = tokenizer(["导出示例文本", "第二条较长的导出示例文本"], padding=True, return_tensors='pt')
+    names = list(sample.keys())
+
+    class _Encoder(torch.nn.Module):
+        """
+        按 names 的顺序接收位置参数，再以关键字传给模型：分词器输出的顺序
+        （input_ids, token_type_ids, attention_mask）与 BertModel.forward 的位置参数
+        顺序不同，直接按位置传会把 token_type_ids 当成 attention_mask。
+        """
+
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, *inputs):
+            return self.encoder(**dict(zip(names, inputs))).last_hidden_state
+
+    fp32_path = os.path.join(output_dir, 'model.onnx')
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(model),
+            tuple(sample[name] for name in names),
+            fp32_path,
+            input_names=names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    int8_path = os.path.join(output_dir, 'model_int8.onnx')
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+def create_embedding_backend(name: Optional[str] = None) -> EmbeddingBackend:
+    """按 Config.EMBEDDING_BACKEND 创建嵌入后端"""
+    name = name or Config.EMBEDDING_BACKEND
+    if name == 'torch':
+        return TorchEmbeddingBackend(Config.EMBEDDING_MODEL, Config.EMBEDDING_THREADS)
+    if name == 'onnx':
+        return OnnxEmbeddingBackend(Config.EMBEDDING_ONNX_DIR, Config.EMBEDDING_THREADS, Config.EMBEDDING_MAX_LENGTH)
+    raise ValueError(f"不支持的嵌入后端: {name}，可选 {BACKENDS}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="嵌入后端工具")
+    parser.add_argument('command', choices=['export'], help='export: 导出 int8 量化的 ONNX 模型')
+    parser.add_argument('--model', default=Config.EMBEDDING_MODEL)
+    parser.add_argument('--output', default=Config.EMBEDDING_ONNX_DIR)
+    args = parser.parse_args()
+
+    print(f"已导出: {export_onnx_model(args.model, args.output)}")
@@ -0,0 +1,77 @@
+import numpy as np
+
+AGGREGATIONS = ("mean", "max", "topk")
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """按行做 L2 归一化，零向量保持为零"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingRingBuffer:
+    """
+    最近 capacity 条新闻嵌入的环形缓冲区。
+
+    向量在写入时做 L2 归一化，存放在预分配的 (capacity, dim) 矩阵中，
+    一批新条目与历史的余弦相似度只需一次矩阵乘法；内存占用固定。
+    """
+
+    def __init__(self, dim: int, capacity: int = 100, dtype: str = "float32"):
+        self.dim = dim
+        self.capacity = capacity
+        self._data = np.zeros((capacity, dim), dtype=np.dtype(dtype))
+        self._next = 0  # 下一个写入位置
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def add(self, embeddings: np.ndarray):
+        """批量写入嵌入，超出容量时覆盖最旧的条目"""
+        rows = l2_normalize(embeddings)[-self.capacity:]
+        n = len(rows)
+        end = self._next + n
+        if end <= self.capacity:
+            self._data[self._next:end] = rows
+        else:
+            split = self.capacity - self._next
+            self._data[self._next:] = rows[:split]
+            self._data[:n - split] = rows[split:]
+        self._next = end % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def similarities(self, queries: np.ndarray) -> np.ndarray:
+        """返回 (len(queries), len(self)) 的余弦相似度矩阵"""
+        queries = l2_normalize(queries).astype(self._data.dtype, copy=False)
+        return (queries @ self._data[:self._size].T).astype(np.float32, copy=False)
+
+    def surprise_scores(self, queries: np.ndarray, aggregation: str = "mean", top_k: int = 10) -> np.ndarray:
+        """
+        计算每条查询向量的意外性分数 1 - 聚合相似度。
+
+        aggregation 为 mean（与历史的平均相似度）、max（与最相似的一条）
+        或 topk（与最相似的 top_k 条的平均）；历史为空时分数均为 1.0。
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"不支持的聚合方式: {aggregation}")
+
+        n = len(np.atleast_2d(queries))
+        if not self._size:
+            return np.ones(n, dtype=np.float32)
+
+        sims = self.similarities(queries)
+        if aggregation == "mean":
+            agg = sims.mean(axis=1)
+        elif aggregation == "max":
+            agg = sims.max(axis=1)
+        else:
+            k = min(top_k, self._size)
+            agg = np.partition(sims, self._size - k, axis=1)[:, -k:].mean(axis=1)
+        return 1.0 - agg
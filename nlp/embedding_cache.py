@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from crawler.ttl_cache import TTLCache
+
+
+def text_key(model_name: str, text: str) -> int:
+    """(模型名, 规范化文本) 的 8 字节哈希，0 保留表示空槽位"""
+    normalized = ' '.join((text or '').split())
+    digest = hashlib.blake2b(f"{model_name}\x00{normalized}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+class EmbeddingCache:
+    """
+    文本嵌入的两级缓存：内存 LRU + 磁盘 memmap。
+
+    磁盘层是容量固定的定长向量数组，按写入顺序环形淘汰最旧的条目（FIFO），
+    键数组同样存放在 memmap 中，启动时据此重建 键 -> 槽位 的索引。
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, path: str, model_name: str, dim: int, capacity: int = 50000,
+                 lru_size: int = 2048, dtype: str = "float32"):
+        self.path = path
+        self.model_name = model_name
+        self.dim = dim
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self.memory = TTLCache(maxsize=lru_size)
+        self.disk_hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+        meta = self._read_meta()
+        mode = "w+" if meta is None else "r+"
+        self.vectors = np.memmap(os.path.join(path, "vectors.mmap"), dtype=self.dtype, mode=mode, shape=(capacity, dim))
+        self.keys = np.memmap(os.path.join(path, "keys.mmap"), dtype=np.uint64, mode=mode, shape=(capacity,))
+        self._next = meta["next"] if meta else 0
+        used = np.flatnonzero(self.keys)
+        self._slots: Dict[int, int] = dict(zip(self.keys[used].tolist(), used.tolist()))
+        if meta is None:
+            self.flush()
+
+    def _meta_header(self) -> dict:
+        return {"model": self.model_name, "dim": self.dim, "capacity": self.capacity, "dtype": self.dtype.name}
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.path, self.META_FILE)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # 模型或向量规格变化时丢弃旧缓存
+        header = self._meta_header()
+        return meta if {k: meta.get(k) for k in header} == header else None
+
+    def key(self, text: str) -> int:
+        return text_key(self.model_name, text)
+
+    def get(self, key: int) -> Optional[np.ndarray]:
+        vector = self.memory.get(key)
+        if vector is not None:
+            return vector
+        slot = self._slots.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        vector = np.array(self.vectors[slot], dtype=np.float32)
+        self.memory.set(key, vector)
+        return vector
+
+    def put_many(self, keys: List[int], vectors: np.ndarray):
+        """写入两级缓存；磁盘满时覆盖最旧的槽位"""
+        for key, vector in zip(keys, vectors):
+            self.memory.set(key, vector)
+            if key in self._slots:
+                continue
+            slot = self._next
+            old_key = int(self.keys[slot])
+            if old_key:
+                self._slots.pop(old_key, None)
+            self.vectors[slot] = vector
+            self.keys[slot] = key
+            self._slots[key] = slot
+            self._next = (slot + 1) % self.capacity
+        self.flush()
+
+    def flush(self):
+        self.vectors.flush()
+        self.keys.flush()
+        tmp = os.path.join(self.path, self.META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({**self._meta_header(), "next": self._next}, f)
+        os.replace(tmp, os.path.join(self.path, self.META_FILE))
+
+    def stats(self) -> Dict:
+        memory_hits = self.memory.hits
+        total = memory_hits + self.disk_hits + self.misses
+        return {
+            'memory_size': len(self.memory),
+            'disk_size': len(self._slots),
+            'memory_hits': memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (memory_hits + self.disk_hits) / total if total else 0.0,
+        }
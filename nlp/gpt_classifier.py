@@ -1,18 +1,36 @@
+import hashlib
 import json
+from functools import lru_cache
 from typing import Dict, List, Optional
 
-import openai
-from litellm import acompletion
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config import Config
+from crawler.local_store import SqliteKVStore, state_path
+
+# 修改系统提示词或用户提示词模板时递增，使旧的缓存结果失效
+PROMPT_VERSION = 1
 
 
 class GPTBlackSwanClassifier:
-    def __init__(self):
-        openai.api_key = Config.OPENAI_API_KEY
+    def __init__(self, cache: Optional[SqliteKVStore] = None):
         self.model = Config.OPENAI_MODEL
         self.system_prompt = self._create_system_prompt()
+        # 分类结果缓存：热榜重复轮询、重启重处理和多源转载的相同新闻不再重复请求
+        self.cache = cache or SqliteKVStore('llm_classifications', state_path(Config.LLM_CACHE_DB))
+        self.cache.purge_older_than(Config.LLM_CACHE_TTL)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _acompletion():
+        """litellm / openai 导入很慢，首次分析时才导入"""
+        import openai
+        from litellm import acompletion
+
+        openai.api_key = Config.OPENAI_API_KEY
+        return acompletion
 
     def _create_system_prompt(self) -> str:
         """创建系统提示词，定义黑天鹅事件的判断标准"""
@@ -40,6 +58,15 @@ class GPTBlackSwanClassifier:
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def analyze_news_async(self, title: str, content: str, context: Optional[Dict] = None) -> Dict:
         """异步分析新闻是否为黑天鹅事件"""
+        cache_key = self._cache_key(title, content)
+        cached = self.cache.get(cache_key, max_age=Config.LLM_CACHE_TTL)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+
+        acompletion = self._acompletion()
+
         user_prompt = self._create_user_prompt(title, content, context)
 
         try:
@@ -55,12 +82,38 @@ class GPTBlackSwanClassifier:
             )
 
             result = response.choices[0].message.content
-            return self._parse_response(result)
 
         except Exception as e:
             print(f"OpenAI API调用失败: {e}")
             return self._get_fallback_response(title, content)
 
+        try:
+            analysis = self._load_response(result)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"解析GPT响应失败: {e}")
+            print(f"原始响应: {result}")
+            return self._get_fallback_response("", "")
+
+        # 只缓存模型的有效结果，备用响应不缓存
+        self.cache.set(cache_key, analysis)
+        return analysis
+
+    def _cache_key(self, title: str, content: str) -> str:
+        """(模型, 提示词版本, 规范化标题+内容) 的哈希"""
+        # 与提示词一致只取内容前 2000 字，并合并空白
+        text = ' '.join(f"{title}\n{(content or '')[:2000]}".split())
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{self.model}:{PROMPT_VERSION}:{digest}"
+
+    def cache_stats(self) -> Dict:
+        """分类缓存命中率"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / total if total else 0.0,
+        }
+
     def analyze_news_sync(self, title: str, content: str, context: Optional[Dict] = None) -> Dict:
         """同步分析新闻（用于非异步环境）"""
         import asyncio
@@ -80,30 +133,24 @@ class GPTBlackSwanClassifier:
         prompt += "\n请分析这条新闻是否属于黑天鹅事件，并给出详细的分析。"
         return prompt
 
-    def _parse_response(self, response_text: str) -> Dict:
-        """解析GPT响应"""
-        try:
-            # 清理响应文本，确保是有效的JSON
-            cleaned_text = response_text.strip()
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]
-
-            result = json.loads(cleaned_text)
+    def _load_response(self, response_text: str) -> Dict:
+        """解析并校验GPT响应，无效时抛出 ValueError"""
+        # 清理响应文本，确保是有效的JSON
+        cleaned_text = response_text.strip()
+        if cleaned_text.startswith('```json'):
+            cleaned_text = cleaned_text[7:]
+        if cleaned_text.endswith('```'):
+            cleaned_text = cleaned_text[:-3]
 
-            # 验证必需字段
-            required_fields = ['is_black_swan', 'confidence_score', 'reasoning']
-            for field in required_fields:
-                if field not in result:
-                    raise ValueError(f"Missing required field: {field}")
+        result = json.loads(cleaned_text)
 
-            return result
+        # 验证必需字段
+        required_fields = ['is_black_swan', 'confidence_score', 'reasoning']
+        for field in required_fields:
+            if field not in result:
+                raise ValueError(f"Missing required field: {field}")
 
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"解析GPT响应失败: {e}")
-            print(f"原始响应: {response_text}")
-            return self._get_fallback_response("", "")
+        return result
 
     def _get_fallback_response(self, title: str, content: str) -> Dict:
         """备用的基于规则的响应"""
@@ -0,0 +1,119 @@
+import hashlib
+import itertools
+import re
+import time
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+_STRIP_RE = re.compile(r'[\s\W_]+', re.UNICODE)
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_text(text: str) -> str:
+    """去掉空白和标点并转小写，消除不同来源的格式差异（如【】、全角标点）"""
+    return _STRIP_RE.sub('', text or '').lower()
+
+
+def shingles(text: str, size: int = 2) -> FrozenSet[str]:
+    """字符 n-gram 集合（中文短文本用二元组效果最好）"""
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """用 num_perm 个 (a*x + b) mod p 形式的哈希函数计算 MinHash 签名"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: FrozenSet[str]) -> np.ndarray:
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in items),
+            dtype=np.uint64, count=len(items),
+        )
+        # 32 位哈希值与 31 位系数相乘不会溢出 uint64
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % _MERSENNE_PRIME).min(axis=1)
+
+
+class StoryClusterIndex:
+    """
+    滚动时间窗口内的跨源近重复索引：字符二元组 MinHash + LSH 分段。
+
+    签名切分为 bands 段，任意一段完全相同的文本成为候选，再用精确的
+    Jaccard 相似度确认（不低于 threshold 视为同一事件）。
+    """
+
+    def __init__(self, window_seconds: float, threshold: float = 0.5,
+                 num_perm: int = 64, bands: int = 16, shingle_size: int = 2):
+        if num_perm % bands:
+            raise ValueError("num_perm 必须能被 bands 整除")
+        self.window_seconds = window_seconds
+        self.threshold = threshold
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.tables: List[Dict[bytes, List[tuple]]] = [{} for _ in range(bands)]
+        self.entries = deque()  # (时间, 二元组集合, 各段键, 簇 id)，按时间排序
+        self._next_cluster_id = itertools.count(1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(len(self.tables))]
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self.entries and self.entries[0][0] < cutoff:
+            entry = self.entries.popleft()
+            for table, key in zip(self.tables, entry[2]):
+                bucket = table.get(key)
+                if bucket is not None:
+                    bucket.remove(entry)
+                    if not bucket:
+                        del table[key]
+
+    def _find(self, items: FrozenSet[str], band_keys: List[bytes]) -> Optional[int]:
+        checked = set()
+        for table, key in zip(self.tables, band_keys):
+            for entry in table.get(key, ()):
+                if id(entry) in checked:
+                    continue
+                checked.add(id(entry))
+                if jaccard(items, entry[1]) >= self.threshold:
+                    return entry[3]
+        return None
+
+    def assign(self, text: str, now: Optional[float] = None) -> Tuple[int, bool]:
+        """
+        把文本归入故事簇。
+
+        返回:
+            (cluster_id, is_new): is_new 为 True 表示新建的簇（该文本是簇的第一个成员）。
+        """
+        now = now if now is not None else time.time()
+        self._expire(now)
+        items = shingles(normalize_text(text), self.shingle_size)
+        if not items:
+            return next(self._next_cluster_id), True
+        band_keys = self._band_keys(self.hasher.signature(items))
+        cluster_id = self._find(items, band_keys)
+        is_new = cluster_id is None
+        if is_new:
+            cluster_id = next(self._next_cluster_id)
+        entry = (now, items, band_keys, cluster_id)
+        self.entries.append(entry)
+        for table, key in zip(self.tables, band_keys):
+            table.setdefault(key, []).append(entry)
+        return cluster_id, is_new
+
+    def __len__(self) -> int:
+        return len(self.entries)
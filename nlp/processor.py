@@ -1,63 +1,271 @@
-from typing import Dict
+import asyncio
+import threading
+from typing import Dict, List, Optional
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
 from config import Config
+from crawler.local_store import state_path
+from crawler.ttl_cache import TTLCache
+from logging_config import logger
+from models.news_item import NewsItem
+from nlp.ann_index import IVFFlatIndex
+from nlp.embedding_backends import create_embedding_backend
+from nlp.embedding_buffer import EmbeddingRingBuffer
+from nlp.embedding_cache import EmbeddingCache
 from nlp.gpt_classifier import GPTBlackSwanClassifier
+from nlp.near_dup import StoryClusterIndex
 
 
 class EnhancedNewsProcessor:
     def __init__(self):
         self.gpt_classifier = GPTBlackSwanClassifier()
-        self.embedding_model = SentenceTransformer(Config.EMBEDDING_MODEL)
         self.historical_context = []
+        # 嵌入模型及依赖其维度的组件在首次使用（或 warm_up）时才加载，避免拖慢启动
+        self.embedding_model = None
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        self.embedding_history: Optional[EmbeddingRingBuffer] = None
+        self.embedding_index: Optional[IVFFlatIndex] = None
+        self._model_lock = threading.Lock()
+        # 跨源近重复聚类：同一事件只有簇内第一条会做嵌入和 GPT 分析
+        self.story_index = StoryClusterIndex(Config.NEAR_DUP_WINDOW_SECONDS, Config.NEAR_DUP_THRESHOLD)
+        self._cluster_results = TTLCache(maxsize=10000, ttl=Config.NEAR_DUP_WINDOW_SECONDS)
+        self.cluster_hits = 0
+
+    @property
+    def model_loaded(self) -> bool:
+        return self.embedding_model is not None
+
+    def load_model(self):
+        """加载嵌入模型并初始化嵌入缓存与历史索引（线程安全，可重复调用）"""
+        if self.model_loaded:
+            return
+        with self._model_lock:
+            if self.model_loaded:
+                return
+            model = create_embedding_backend()
+            dim = model.get_sentence_embedding_dimension()
+            # 文本嵌入缓存：热榜等反复出现的文本以及重启后的重复处理不再重新编码
+            self.embedding_cache = EmbeddingCache(
+                state_path(Config.EMBEDDING_CACHE_DIR),
+                f"{Config.EMBEDDING_MODEL}:{model.name}",
+                dim,
+                capacity=Config.EMBEDDING_CACHE_CAPACITY,
+                lru_size=Config.EMBEDDING_CACHE_LRU_SIZE,
+            )
+            # 最近新闻的归一化嵌入，用于批量计算意外性分数
+            self.embedding_history = EmbeddingRingBuffer(dim, capacity=Config.SURPRISE_WINDOW, dtype=Config.SURPRISE_DTYPE)
+            # 保留期内全部历史嵌入的持久化索引，用于长周期意外性
+            self.embedding_index = IVFFlatIndex(
+                state_path(Config.EMBEDDING_INDEX_DIR),
+                dim,
+                capacity=Config.EMBEDDING_INDEX_CAPACITY,
+                nlist=Config.EMBEDDING_INDEX_NLIST,
+                nprobe=Config.EMBEDDING_INDEX_NPROBE,
+                dtype=Config.EMBEDDING_INDEX_DTYPE,
+                retention_seconds=Config.EMBEDDING_INDEX_RETENTION_DAYS * 86400,
+                model_name=f"{Config.EMBEDDING_MODEL}:{model.name}",
+            )
+            self.embedding_model = model
+
+    def cleanup(self) -> int:
+        """清除嵌入索引中超过保留期的条目，返回清除数量（模型未加载时跳过）"""
+        if not self.model_loaded:
+            return 0
+        return self.embedding_index.evict()
+
+    def warm_up(self) -> threading.Thread:
+        """在后台线程中预加载模型，抓取可以同时开始"""
+        thread = threading.Thread(target=self.load_model, name="embedding-warmup", daemon=True)
+        thread.start()
+        return thread
 
     async def process_news_async(self, news_item: Dict) -> Dict:
         """异步处理新闻"""
-        # 生成文本嵌入
-        embedding = self._generate_embedding(news_item['content'])
-
-        # 使用GPT分析
-        gpt_result = await self.gpt_classifier.analyze_news_async(
-            news_item['title'],
-            news_item['content'],
-            self._get_context()
-        )
+        result = (await self.process_news_batch([news_item]))[0]
+        if result is None:
+            raise RuntimeError("新闻处理失败")
+        return result
+
+    async def process_news_batch(self, news_items: List[Dict], batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        批量处理一次轮询的新闻：簇内第一条的嵌入按长度分桶批量生成，
+        GPT 分析并发进行（并发数受 Config.LLM_MAX_CONCURRENCY 限制），
+        近重复条目直接沿用簇内第一条的结果。返回结果与输入顺序一致，
+        处理失败的条目对应 None，不影响同批其他条目。
+        """
+        items = [item.to_dict() if isinstance(item, NewsItem) else item for item in news_items]
+        results: List[Optional[Dict]] = [None] * len(items)
+        loop = asyncio.get_running_loop()
+        leaders = []  # (下标, 簇 id, future)
+        members = []  # (下标, 簇 id, 簇内第一条的 future)
+
+        for i, item in enumerate(items):
+            cluster_id, is_new = self.story_index.assign(self._cluster_text(item))
+            leader = None if is_new else self._cluster_results.get(cluster_id)
+            if leader is not None:
+                members.append((i, cluster_id, leader))
+                continue
+            future = loop.create_future()
+            self._cluster_results.set(cluster_id, future)
+            leaders.append((i, cluster_id, future))
+
+        if leaders:
+            try:
+                analyzed = await self._analyze_items([items[i] for i, _, _ in leaders], batch_size)
+                for (i, cluster_id, future), result in zip(leaders, analyzed):
+                    if result is not None:
+                        result['cluster_id'] = cluster_id
+                    future.set_result(result)
+                    results[i] = result
+            finally:
+                # 出错或被取消时也要结束 future，否则其他批次中等待的簇成员会一直挂起；
+                # 结果为 None 时簇成员各自处理
+                for _, _, future in leaders:
+                    if not future.done():
+                        future.set_result(None)
+
+        for i, cluster_id, leader in members:
+            # 簇内第一条可能仍在其他批次中处理，等待其结果
+            leader_result = await asyncio.shield(leader)
+            if leader_result is None:
+                result = (await self._analyze_items([items[i]], batch_size))[0]
+                if result is not None:
+                    result['cluster_id'] = cluster_id
+                results[i] = result
+            else:
+                results[i] = self._attach_to_cluster(items[i], leader_result, cluster_id)
+        return results
+
+    async def _analyze_items(self, items: List[Dict], batch_size: Optional[int] = None) -> List[Optional[Dict]]:
+        """批量分析；整批失败时逐条重试，失败的条目返回 None"""
+        try:
+            return await self._analyze_batch(items, batch_size)
+        except Exception as e:
+            if len(items) == 1:
+                logger.error(f"处理新闻失败: {items[0].get('title', '')[:50]}: {e}")
+                return [None]
+            logger.warning(f"批量处理 {len(items)} 条新闻失败，改为逐条处理: {e}")
+            return [(await self._analyze_items([item], batch_size))[0] for item in items]
+
+    async def _analyze_batch(self, items: List[Dict], batch_size: Optional[int] = None) -> List[Optional[Dict]]:
+        # 模型尚未加载完时在线程中等待，不阻塞事件循环上的抓取任务
+        if not self.model_loaded:
+            await asyncio.to_thread(self.load_model)
+
+        # 批量生成文本嵌入
+        embeddings = self._generate_embeddings([item['content'] for item in items], batch_size)
 
-        # 计算意外性分数
-        surprise_score = self._calculate_surprise_score(embedding)
+        # 并发使用GPT分析
+        context = self._get_context()
+        semaphore = asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY)
 
-        # 综合评分
-        final_score = self._calculate_final_score(gpt_result, surprise_score)
+        async def classify(item):
+            async with semaphore:
+                return await self.gpt_classifier.analyze_news_async(item['title'], item['content'], context)
 
+        # 单条分析失败只影响该条
+        gpt_results = await asyncio.gather(*(classify(item) for item in items), return_exceptions=True)
+
+        # 一次矩阵乘法计算整批的意外性分数，再把本批嵌入写入历史
+        surprise_scores = self._calculate_surprise_scores(embeddings)
+        self.embedding_history.add(embeddings)
+        self.embedding_index.add(embeddings)
+
+        results = []
+        for item, embedding, gpt_result, surprise_score in zip(items, embeddings, gpt_results, surprise_scores):
+            if isinstance(gpt_result, BaseException):
+                logger.error(f"GPT分析失败: {item.get('title', '')[:50]}: {gpt_result}")
+                results.append(None)
+                continue
+            surprise_score = float(surprise_score)
+
+            # 综合评分
+            final_score = self._calculate_final_score(gpt_result, surprise_score)
+
+            results.append({
+                **item,
+                'embedding': embedding,
+                'gpt_analysis': gpt_result,
+                'surprise_score': surprise_score,
+                'final_black_swan_score': final_score,
+                'is_black_swan': final_score >= 0.7,
+                'is_duplicate': False,
+            })
+        return results
+
+    def _cluster_text(self, news_item: Dict) -> str:
+        """用于近重复判断的文本：标题加正文开头"""
+        content = news_item.get('content') or ''
+        title = news_item.get('title') or ''
+        return title if content == title else f"{title} {content[:200]}"
+
+    def _attach_to_cluster(self, news_item: Dict, leader_result: Dict, cluster_id: int) -> Dict:
+        """把近重复条目挂到簇内第一条的分析结果上，不再做嵌入和 GPT 分析"""
+        self.cluster_hits += 1
         return {
             **news_item,
-            'embedding': embedding,
-            'gpt_analysis': gpt_result,
-            'surprise_score': surprise_score,
-            'final_black_swan_score': final_score,
-            'is_black_swan': final_score >= 0.7
+            'embedding': leader_result['embedding'],
+            'gpt_analysis': leader_result['gpt_analysis'],
+            'surprise_score': leader_result['surprise_score'],
+            'final_black_swan_score': leader_result['final_black_swan_score'],
+            'is_black_swan': leader_result['is_black_swan'],
+            'cluster_id': cluster_id,
+            # 快讯可能没有链接（duplicate_of 为 None），是否为簇内重复以 is_duplicate 为准
+            'is_duplicate': True,
+            'duplicate_of': leader_result.get('url'),
         }
 
     def _generate_embedding(self, text: str) -> np.ndarray:
         """生成文本嵌入向量"""
-        return self.embedding_model.encode([text])[0]
+        return self._generate_embeddings([text])[0]
+
+    def _generate_embeddings(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        批量生成文本嵌入：先查嵌入缓存，只对未缓存的文本编码。未命中的文本按长度
+        排序后分桶编码，同一桶内长度相近，减少 padding 浪费；结果按输入顺序返回。
+        """
+        self.load_model()
+        keys = [self.embedding_cache.key(text) for text in texts]
+        cached = {}
+        missing = {}  # 键 -> 文本，同一批内的重复文本只编码一次
+        for key, text in zip(keys, texts):
+            if key in cached or key in missing:
+                continue
+            vector = self.embedding_cache.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                cached[key] = vector
+
+        if missing:
+            batch_size = batch_size or Config.EMBEDDING_BATCH_SIZE
+            new_keys = sorted(missing, key=lambda k: len(missing[k]))
+            for start in range(0, len(new_keys), batch_size):
+                bucket = new_keys[start:start + batch_size]
+                encoded = self.embedding_model.encode([missing[k] for k in bucket], batch_size=len(bucket))
+                self.embedding_cache.put_many(bucket, encoded)
+                cached.update(zip(bucket, encoded))
+
+        return np.stack([cached[key] for key in keys])
 
     def _calculate_surprise_score(self, current_embedding: np.ndarray) -> float:
         """基于嵌入相似度计算意外性分数"""
-        if not self.historical_context:
-            return 1.0
+        return float(self._calculate_surprise_scores(current_embedding)[0])
 
-        similarities = []
-        for hist_embedding in self.historical_context[-100:]:  # 最近100条
-            similarity = np.dot(current_embedding, hist_embedding) / (
-                    np.linalg.norm(current_embedding) * np.linalg.norm(hist_embedding)
-            )
-            similarities.append(similarity)
-
-        avg_similarity = np.mean(similarities) if similarities else 0
-        return 1 - avg_similarity
+    def _calculate_surprise_scores(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        批量计算意外性分数：短周期为 1 - 与最近 SURPRISE_WINDOW 条新闻的聚合余弦相似度，
+        长周期为 1 - 与保留期内最相似 SURPRISE_INDEX_TOP_K 条的平均相似度，两者按
+        SURPRISE_LONG_WEIGHT 加权。
+        """
+        self.load_model()
+        short_term = self.embedding_history.surprise_scores(
+            embeddings, Config.SURPRISE_AGGREGATION, Config.SURPRISE_TOP_K
+        )
+        long_term = self.embedding_index.surprise_scores(embeddings, Config.SURPRISE_INDEX_TOP_K)
+        weight = Config.SURPRISE_LONG_WEIGHT
+        return (1 - weight) * short_term + weight * long_term
 
     def _calculate_final_score(self, gpt_result: Dict, surprise_score: float) -> float:
         """计算最终的黑天鹅评分"""
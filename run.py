@@ -10,10 +10,11 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.main import NewsMonitorApp
-from logging_config import logger
+from logging_config import logger, setup_logging
 
 def main():
     """主函数"""
+    setup_logging()
     try:
         app = NewsMonitorApp()
         app.run()
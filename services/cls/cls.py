@@ -1,8 +1,7 @@
-import asyncio
-import time
-
-import aiohttp
-
+from crawler.async_news_fetcher import fetch_url_json
+from crawler.cursor_store import get_source_cursor
+from crawler.http_pool import run_with_session
+from crawler.json_schemas import CLS_TELEGRAPH
 from services.cls.utils import get_search_params, get_cls_header
 
 
@@ -15,10 +14,8 @@ class Item:
         self.ctime = ctime
         self.is_ad = is_ad
 
-async def my_fetch(url, params):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params, headers= get_cls_header()) as response:
-            return await response.json()
+async def my_fetch(url, params, schema=None):
+    return await fetch_url_json(url, params=params, headers=get_cls_header(), schema=schema)
 
 async def depth():
     api_url = "https://www.cls.cn/v3/depth/home/assembled/1000"
@@ -54,11 +51,16 @@ async def hot():
 
 async def telegraph():
     api_url = "https://www.cls.cn/nodeapi/updateTelegraphList"
-    last_time = int(time.time())
-    params = get_search_params({})
-    res = await my_fetch(api_url, params)
-    items = [k for k in res["data"]["roll_data"] if not k.get("is_ad")]
-    print(items)
+    cursor = get_source_cursor("cls-telegraph")
+    more_params = {}
+    if cursor.last_key:
+        # 只请求上次最新电报之后的增量数据
+        more_params["lastTime"] = cursor.last_key
+    params = get_search_params(more_params)
+    res = await my_fetch(api_url, params, schema=CLS_TELEGRAPH)
+    # 先按高水位丢弃已处理的电报，再做后续处理
+    roll_data = cursor.filter_new(res["data"]["roll_data"], id_key=lambda k: k["id"], sort_key=lambda k: k["ctime"])
+    items = [k for k in roll_data if not k.get("is_ad")]
     return [
         {
             "id": k["id"],
@@ -78,6 +80,5 @@ def define_source():
         "cls-hot": hot,
     }
 
-
-
-asyncio.run((telegraph()))
\ No newline at end of file
+if __name__ == "__main__":
+    print(run_with_session(telegraph()))
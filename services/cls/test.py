@@ -1,13 +1,18 @@
+import asyncio
 import json
 from datetime import datetime
 
-import requests
-from bs4 import BeautifulSoup
-
-from services.cls.utils import get_search_params
+from config import Config
+from crawler.async_news_fetcher import fetch_url, fetch_url_json
+from crawler.http_pool import run_with_session
+from crawler.ttl_cache import TTLCache
+from services.cls.utils import get_search_params, get_cls_header
 
 ROOT_URL = "https://www.cls.cn"
 
+# 文章详情缓存：热门榜单上的文章会在多次轮询中重复出现
+_detail_cache = TTLCache(maxsize=Config.CLS_DETAIL_CACHE_SIZE, ttl=Config.CLS_DETAIL_CACHE_TTL)
+
 
 def parse_date(timestamp):
     # timestamp 为毫秒数
@@ -18,31 +23,35 @@ def render_description(article_detail):
     # 这里简单返回正文，实际可自定义模板
     return article_detail.get("content", "")
 
-def fetch_hot_articles(limit=50):
+async def fetch_hot_articles(limit=50):
     api_url = f"{ROOT_URL}/v2/article/hot/list"
-    headers = {
-        'accept':'application/json',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    resp = requests.get(api_url, headers = headers, params=get_search_params({}))
-    resp.raise_for_status()
-    data = resp.json()
+    data = await fetch_url_json(api_url, params=get_search_params({}), headers=get_cls_header())
     items = []
     for item in data["data"][:limit]:
         items.append({
+            "id": item["id"],
             "title": item.get("title") or item.get("brief"),
             "link": f"{ROOT_URL}/detail/{item['id']}",
             "pubDate": parse_date(item["ctime"] * 1000),
         })
     return items
 
-def fetch_article_detail(link):
-    resp = requests.get(link)
-    soup = BeautifulSoup(resp.text, "html.parser")
-    script = soup.select_one("script#__NEXT_DATA__")
-    if not script:
+def extract_next_data(html):
+    """直接截取 script#__NEXT_DATA__ 的内容，无需构建整个 DOM"""
+    marker = html.find('id="__NEXT_DATA__"')
+    if marker == -1:
+        return None
+    start = html.find('>', marker) + 1
+    end = html.find('</script>', start)
+    if start == 0 or end == -1:
+        return None
+    return json.loads(html[start:end])
+
+async def fetch_article_detail(link):
+    html = await fetch_url(link, headers=get_cls_header())
+    next_data = extract_next_data(html)
+    if not next_data:
         return {}
-    next_data = json.loads(script.text)
     article_detail = (
         next_data.get("props", {})
         .get("initialState", {})
@@ -51,16 +60,30 @@ def fetch_article_detail(link):
     )
     return article_detail
 
-def enrich_items(items):
-    for item in items:
-        article_detail = fetch_article_detail(item["link"])
-        item["author"] = article_detail.get("author", {}).get("name", "")
-        item["description"] = render_description(article_detail)
-    return items
+async def _enrich_item(semaphore, item):
+    article_detail = _detail_cache.get(item["id"])
+    if article_detail is None:
+        async with semaphore:
+            try:
+                article_detail = await fetch_article_detail(item["link"])
+            except Exception as e:
+                print(f"Error fetching {item['link']}: {str(e)}")
+                article_detail = None
+        if article_detail:
+            _detail_cache.set(item["id"], article_detail)
+    article_detail = article_detail or {}
+    item["author"] = article_detail.get("author", {}).get("name", "")
+    item["description"] = render_description(article_detail)
+    return item
+
+async def enrich_items(items):
+    """并发获取文章详情（并发数受 Config.MAX_CONCURRENT_REQUESTS 限制），已缓存的文章不再请求"""
+    semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+    return list(await asyncio.gather(*(_enrich_item(semaphore, item) for item in items)))
 
-def get_cls_hot(limit=50):
-    items = fetch_hot_articles(limit)
-    items = enrich_items(items)
+async def get_cls_hot(limit=50):
+    items = await fetch_hot_articles(limit)
+    items = await enrich_items(items)
     return {
         "title": "财联社 - 热门文章排行榜",
         "link": ROOT_URL,
@@ -68,5 +91,5 @@ def get_cls_hot(limit=50):
     }
 
 if __name__ == "__main__":
-    result = get_cls_hot(10)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    result = run_with_session(get_cls_hot(10))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -1,22 +1,115 @@
 import asyncio
 import json
+import os
+import xml.etree.ElementTree as ET
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional
+
 import feedparser
 
-from crawler.async_news_fetcher import fetch_url
+from config import Config
+from crawler.async_news_fetcher import fetch_url, fetch_url_if_changed
+from crawler.cursor_store import get_source_cursor
+from crawler.feed_stream import iter_feed_entries
+from crawler.http_cache import PendingValidators
+from crawler.rss_dup import get_rss_deduplicator
+from models.news_item import NewsItem, normalize_item, normalize_items
+
+RSS_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rss.json')
+
 
-async def fetch_rss():
-    with open('../rss.json', 'r', encoding='utf-8') as f:
+@lru_cache(maxsize=1)
+def load_rss_feeds() -> Dict[str, str]:
+    """读取 rss.json 中的订阅源列表（只在首次调用时读盘）"""
+    with open(RSS_CONFIG_PATH, 'r', encoding='utf-8') as f:
         config = json.load(f)
-    rss_feeds = config['rss']
-    print(rss_feeds)
+    return dict(config['rss'])
+
+def _parse_feed(feed_name: str, text: str) -> List[NewsItem]:
+    # 在线程中解析并立即归一化，不在内存中保留 FeedParserDict
+    return normalize_items(feed_name, feedparser.parse(text).entries)
+
+async def _fetch_feed(semaphore: asyncio.Semaphore, feed_name: str, rss_url: str, conditional: bool):
+    async with semaphore:
+        try:
+            validators = None
+            if conditional:
+                result, validators = await fetch_url_if_changed(rss_url)
+            else:
+                result = await fetch_url(rss_url)
+        except Exception as e:
+            print(f"Error fetching {rss_url}: {str(e)}")
+            return feed_name, None
+    if result is None:
+        # 内容未变化（304 或内容哈希一致），跳过解析
+        return feed_name, []
+    try:
+        # feedparser 是纯 Python 的 CPU 密集型解析，放到线程池避免阻塞事件循环
+        entries = await asyncio.to_thread(_parse_feed, feed_name, result)
+        if validators is not None:
+            # 解析成功后登记，条目处理完成后随本轮提交一起保存校验信息
+            get_source_cursor(f"rss:{feed_name}").defer(validators.commit)
+        return feed_name, entries
+    except Exception as e:
+        print(f"Error processing {rss_url}: {str(e)}")
+        return feed_name, None
 
-    for feed_name, rss_url in rss_feeds.items():
+async def _stream_feed(semaphore: asyncio.Semaphore, feed_name: str, rss_url: str,
+                       conditional: bool, seen: Optional[Callable[[NewsItem], Awaitable[bool]]]):
+    async with semaphore:
+        entries = []
+        validators = PendingValidators()
+        fallback = False
         try:
-            result = await fetch_url(rss_url)
-            feed = feedparser.parse(result)
-            return {feed_name: feed.entries}
+            async with aclosing(iter_feed_entries(rss_url, conditional=conditional, validators=validators)) as stream:
+                async for entry in stream:
+                    item = normalize_item(feed_name, entry)
+                    if item is None:
+                        continue
+                    # 订阅源按时间倒序排列，遇到第一个已处理的条目即停止读取；
+                    # 先归一化再判断，与去重记录使用同一个键（NewsItem.dedup_key）
+                    if seen is not None and await seen(item):
+                        break
+                    entries.append(item)
+        except ET.ParseError as e:
+            # 严格的 XML 解析失败（如未定义的 HTML 实体），改用容错的 feedparser 完整解析
+            print(f"Error streaming {rss_url}: {str(e)}, falling back to feedparser")
+            fallback = True
         except Exception as e:
-            print(f"Error processing {rss_url}: {str(e)}")
+            print(f"Error streaming {rss_url}: {str(e)}")
+            return feed_name, None
+    if fallback:
+        return await _fetch_feed(semaphore, feed_name, rss_url, conditional)
+    get_source_cursor(f"rss:{feed_name}").defer(validators.commit)
+    return feed_name, entries
+
+async def fetch_rss(feeds: Dict[str, str] = None, conditional: bool = True, streaming: bool = False,
+                    seen: Optional[Callable[[NewsItem], Awaitable[bool]]] = None) -> Dict[str, List[NewsItem]]:
+    """
+    并发抓取所有 RSS 订阅源，并发数受 Config.MAX_CONCURRENT_REQUESTS 限制。
+    conditional 为 True 时使用条件请求，自上次抓取后未变化的源返回空列表。
+    streaming 为 True 时流式解析，遇到 seen（异步回调，参数为 NewsItem）判定为
+    已处理的条目即停止读取。
+
+    返回:
+        dict: 订阅源名称 -> NewsItem 列表，抓取或解析失败的源不包含在内。
+    """
+    feeds = feeds if feeds is not None else load_rss_feeds()
+    semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+    if streaming:
+        tasks = (_stream_feed(semaphore, feed_name, rss_url, conditional, seen) for feed_name, rss_url in feeds.items())
+    else:
+        tasks = (_fetch_feed(semaphore, feed_name, rss_url, conditional) for feed_name, rss_url in feeds.items())
+    results = await asyncio.gather(*tasks)
+    return {feed_name: entries for feed_name, entries in results if entries is not None}
+
+async def fetch_rss_source() -> Dict[str, List[NewsItem]]:
+    """网关使用的 RSS 源：Config.RSS_STREAMING 为 True 时流式解析，并用 RSS 去重器提前停止"""
+    if Config.RSS_STREAMING:
+        return await fetch_rss(streaming=True, seen=get_rss_deduplicator().is_seen_async)
+    return await fetch_rss()
 
 if __name__ == "__main__":
-    print(asyncio.run(fetch_rss()))
\ No newline at end of file
+    from crawler.http_pool import run_with_session
+    print(run_with_session(fetch_rss()))
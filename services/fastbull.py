@@ -1,71 +1,88 @@
-import asyncio
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional
 
-from bs4 import BeautifulSoup
-
-from crawler.async_news_fetcher import fetch_url
+from crawler.async_news_fetcher import fetch_url_if_changed
+from crawler.cursor_store import get_source_cursor
+from crawler.html_parser import parse_html, parse_in_worker
+from crawler.http_pool import run_with_session
 
 # 假设 NewsItem 是一个 dict，实际项目可用 dataclass 或 pydantic 等替代
 NewsItem = Dict[str, Any]
 
+BASE_URL = "https://www.fastbull.com"
 
-# todo 查询快讯
-async def fastbull_express() -> List[NewsItem]:
-    base_url = "https://www.fastbull.com"
-    html = await fetch_url(f"{base_url}/cn/express-news")
-    soup = BeautifulSoup(html, "html.parser")
-    news_list = soup.select(".news-list")
+
+def parse_fastbull_express(html: str, backend: Optional[str] = None) -> List[NewsItem]:
+    """解析快讯页面（纯函数，在解析工作池中运行）"""
+    root = parse_html(html, backend)
     news: List[NewsItem] = []
 
-    for el in news_list:
-        a = el.select_one(".title_name")
+    for el in root.css(".news-list"):
+        a = el.css_first(".title_name")
         if a is None:
             continue
-        url = a.get("href")
-        title_text = a.get_text()
-        import re
+        url = a.attr("href")
+        title_text = a.text()
         match = re.search(r"【(.+)】", title_text)
         title = match.group(1) if match else title_text
-        date = el.get("data-date")
+        date = el.attr("data-date")
         if url and title and date:
             news.append({
                 "title": title if len(title) >= 4 else title_text,
-                "link": base_url + url,
+                "link": BASE_URL + url,
                 "pubDate": int(date),
             })
     return news
 
-async def fastbull_news() -> List[NewsItem]:
-    base_url = "https://www.fastbull.com"
-    html = await fetch_url(f"{base_url}/cn/news")
-    soup = BeautifulSoup(html, "html.parser")
-    trending = soup.select(".trending_type")
+def parse_fastbull_news(html: str, backend: Optional[str] = None) -> List[NewsItem]:
+    """解析新闻页面（纯函数，在解析工作池中运行）"""
+    root = parse_html(html, backend)
     news: List[NewsItem] = []
 
-    for el in trending:
-        a = el
-        url = a.get("href")
-        title = a.select_one(".title")
-        title_text = title.get_text() if title else ""
+    for a in root.css(".trending_type"):
+        url = a.attr("href")
+        title = a.css_first(".title")
+        title_text = title.text() if title else ""
         # 获取 brief ltr_ar_dir 内容
-        brief_p = a.find("p", class_="brief ltr_ar_dir")
-        brief = brief_p.get_text(strip=True) if brief_p else None
-        date_elem = a.select_one("[data-date]")
-        date = date_elem.get("data-date") if date_elem else None
+        brief_p = a.css_first("p.brief.ltr_ar_dir")
+        brief = brief_p.text(strip=True) if brief_p else None
+        date_elem = a.css_first("[data-date]")
+        date = date_elem.attr("data-date") if date_elem else None
         if url and title_text and date:
             news.append({
                 "title": title_text,
-                "link": base_url + url,
+                "link": BASE_URL + url,
                 "description": brief,
                 "pubDate": int(date),
             })
     return news
 
-def get_fastbull_sources():
+# todo 查询快讯
+async def fastbull_express() -> List[NewsItem]:
+    html, validators = await fetch_url_if_changed(f"{BASE_URL}/cn/express-news")
+    if html is None:
+        return []
+    items = await parse_in_worker(parse_fastbull_express, html)
+    # 校验信息在条目处理完成后随本轮提交一起保存
+    get_source_cursor("fastbull").defer(validators.commit)
+    return items
+
+async def fastbull_news() -> List[NewsItem]:
+    html, validators = await fetch_url_if_changed(f"{BASE_URL}/cn/news")
+    if html is None:
+        return []
+    items = await parse_in_worker(parse_fastbull_news, html)
+    get_source_cursor("fastbull-news").defer(validators.commit)
+    return items
+
+async def _fastbull_all():
     return {
-        "fastbull": asyncio.run(fastbull_express()),
-        "fastbull-news": asyncio.run(fastbull_news()),
+        "fastbull": await fastbull_express(),
+        "fastbull-news": await fastbull_news(),
     }
 
+def get_fastbull_sources():
+    return run_with_session(_fastbull_all())
+
 if __name__ == "__main__":
-    print(asyncio.run(fastbull_express()))
\ No newline at end of file
+    print(run_with_session(fastbull_express()))
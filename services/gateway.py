@@ -1,34 +1,102 @@
 import asyncio
+import time
+from typing import Any, Dict, List, Tuple
 
-from services.crawl import fetch_rss
-from services.fastbull import get_fastbull_sources
+from config import Config
+from crawler.cursor_store import commit_source_cursors, rollback_source_cursors
+from crawler.host_guard import get_host_guard_status
+from crawler.http_pool import close_http_session
+from models.news_item import NewsItem, normalize_items
+from services.crawl import fetch_rss_source
+from services.fastbull import fastbull_express, fastbull_news
 from services.gelonghui import fetch_gelonghui
 from services.jin10 import fetch_jin10_news
 from services.mktnews import fetch_mktnews
 from services.toutiao import fetch_toutiao_hot_events
-from services.wallstreetcn import get_wallstree
-
-
-def get_entry_description(entry):
-    """安全获取条目描述内容"""
-    if hasattr(entry, 'description'):
-        return entry.description
-    elif hasattr(entry, 'summary'):
-        return entry.summary
-    elif hasattr(entry, 'content'):
-        return entry.content[0].value
-    return ""
-
-def query_all():
-    rss = asyncio.run(fetch_rss())
-    fastbull = get_fastbull_sources()
-    gelonghui = fetch_gelonghui()
-    jin10 = asyncio.run(fetch_jin10_news())
-    mkt = asyncio.run(fetch_mktnews())
-    toutiao = asyncio.run(fetch_toutiao_hot_events())
-    wallstreet = get_wallstree()
-    merged_dict = {**rss, **fastbull, **gelonghui, **jin10, **mkt, **toutiao, **wallstreet}
-    return merged_dict
+from services.wallstreetcn import wall_streetcn_live, wallstreetcn_news, wallstreetcn_hot
+from services.xueqiu import get_hot_stocks
+
+
+# 新闻源注册表：源名称 -> 返回该源数据的协程函数
+# 返回 dict 的源（如 {"jin10": [...]}) 直接合并，返回 list 的源以源名称为 key
+SOURCES = {
+    "rss": fetch_rss_source,
+    "fastbull": fastbull_express,
+    "fastbull-news": fastbull_news,
+    "gelonghui": fetch_gelonghui,
+    "jin10": fetch_jin10_news,
+    "mkt": fetch_mktnews,
+    "toutiao": fetch_toutiao_hot_events,
+    "wallstreetcn": wall_streetcn_live,
+    "wallstreetcn-news": wallstreetcn_news,
+    "wallstreetcn-hot": wallstreetcn_hot,
+    "xueqiu": get_hot_stocks,
+}
+
+
+def _normalize_source(name, data) -> Dict[str, List[NewsItem]]:
+    """把单个源的返回值归一化为 源名称 -> NewsItem 列表"""
+    if not isinstance(data, dict):
+        data = {name: data}
+    return {source: normalize_items(source, items) for source, items in data.items()}
+
+async def _run_source(name, fetcher) -> Tuple[str, Any, Dict[str, Any]]:
+    """运行单个新闻源并归一化，带独立超时，返回 (源名称, 归一化数据, 报告)"""
+    timeout = Config.SOURCE_TIMEOUTS.get(name, Config.SOURCE_TIMEOUT)
+    start = time.perf_counter()
+    data, error = None, None
+    try:
+        raw = await asyncio.wait_for(fetcher(), timeout=timeout)
+        # 归一化也在单源的异常隔离内，格式异常的条目只影响本源
+        if raw is not None:
+            data = _normalize_source(name, raw)
+    except asyncio.TimeoutError:
+        error = f"timeout after {timeout}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    if error is not None:
+        # 本源结果被丢弃，待提交的高水位和校验信息一并丢弃，下次抓取重新获取
+        rollback_source_cursors(name)
+    report = {
+        "ok": error is None,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        "error": error,
+    }
+    if data is not None:
+        report["count"] = sum(len(items) for items in data.values())
+    return name, data, report
+
+async def query_all(sources: Dict = None) -> Tuple[Dict[str, List[NewsItem]], Dict[str, Dict[str, Any]]]:
+    """
+    在同一个事件循环中并发抓取所有新闻源，并把各源的条目归一化为 NewsItem。
+
+    返回:
+        (merged, report): merged 为成功源的合并结果（源名称 -> NewsItem 列表）；report 为每个源的
+        ok / latency_ms / error / count（归一化后的条目数）报告，部分源失败时仍返回其余源的结果。
+    """
+    sources = sources or SOURCES
+    results = await asyncio.gather(*(_run_source(name, fetcher) for name, fetcher in sources.items()))
+
+    merged_dict = {}
+    report = {}
+    for name, data, source_report in results:
+        report[name] = source_report
+        if data is not None:
+            merged_dict.update(data)
+    return merged_dict, report
+
+async def _main():
+    try:
+        merged, report = await query_all()
+    finally:
+        await close_http_session()
+    print(merged)
+    # 条目已输出，推进各源高水位
+    commit_source_cursors()
+    for name, info in report.items():
+        print(f"{name}: {info}")
+    for host, info in get_host_guard_status().items():
+        print(f"{host}: {info}")
 
 if __name__ == "__main__":
-    print(query_all())
\ No newline at end of file
+    asyncio.run(_main())
@@ -1,45 +1,99 @@
-from typing import List, Dict, Any
+import re
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
 
-import dateparser
-import requests
-from bs4 import BeautifulSoup
+from crawler.async_news_fetcher import fetch_url_if_changed
+from crawler.cursor_store import get_source_cursor
+from crawler.html_parser import parse_html, parse_in_worker
+from crawler.http_pool import run_with_session
 
+BASE_URL = "https://www.gelonghui.com"
 
-def parse_relative_time(relative_str):
+# 格隆汇实际使用的时间格式
+_AGO_RE = re.compile(r'^(\d+)\s*(秒|分钟|小时|天)前$')
+_DAY_RE = re.compile(r'^(今天|昨天|前天)\s*(\d{1,2}):(\d{2})$')
+_TIME_RE = re.compile(r'^(\d{1,2}):(\d{2})$')
+_MONTH_DAY_RE = re.compile(r'^(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{2})$')
+_DATE_RE = re.compile(r'^(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?:\s+(\d{1,2}):(\d{2})(?::(\d{2}))?)?$')
+_AGO_UNITS = {'秒': 'seconds', '分钟': 'minutes', '小时': 'hours', '天': 'days'}
+_DAY_OFFSETS = {'今天': 0, '昨天': 1, '前天': 2}
+
+
+def _parse_known_format(text: str, now: datetime) -> Optional[datetime]:
+    """解析格隆汇常见的时间格式，无法识别时返回 None"""
+    if text == '刚刚':
+        return now
+    m = _AGO_RE.match(text)
+    if m:
+        return now - timedelta(**{_AGO_UNITS[m.group(2)]: int(m.group(1))})
+    m = _DAY_RE.match(text)
+    if m:
+        day = now - timedelta(days=_DAY_OFFSETS[m.group(1)])
+        return day.replace(hour=int(m.group(2)), minute=int(m.group(3)), second=0, microsecond=0)
+    m = _TIME_RE.match(text)
+    if m:
+        parsed = now.replace(hour=int(m.group(1)), minute=int(m.group(2)), second=0, microsecond=0)
+        # 只有时分且晚于当前时间，说明是昨天发布的（如凌晨抓取到 23:50 的新闻）
+        return parsed - timedelta(days=1) if parsed > now else parsed
+    m = _MONTH_DAY_RE.match(text)
+    if m:
+        month, day, hour, minute = map(int, m.groups())
+        parsed = datetime(now.year, month, day, hour, minute)
+        # 月日晚于当前时间，说明是去年发布的（如 1 月初抓取到 12-31 的新闻）
+        return parsed.replace(year=now.year - 1) if parsed > now else parsed
+    m = _DATE_RE.match(text)
+    if m:
+        year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        hour, minute, second = (int(g) if g else 0 for g in m.groups()[3:])
+        return datetime(year, month, day, hour, minute, second)
+    return None
+
+def parse_relative_time(relative_str, now: Optional[datetime] = None, memo: Optional[Dict] = None):
     """
-    使用 dateparser 解析相对时间字符串。
+    解析相对时间字符串，先匹配格隆汇常见格式，未命中时才使用较慢的 dateparser。
 
     参数:
         relative_str (str): 相对时间字符串。
+        now (datetime): 参考时间，默认为当前时间。
+        memo (dict): 本次抓取内的解析结果缓存。
 
     返回:
         datetime: 解析得到的绝对时间。
     """
-    absolute_time = dateparser.parse(relative_str)
+    if memo is not None and relative_str in memo:
+        return memo[relative_str]
+    text = (relative_str or '').strip()
+    absolute_time = _parse_known_format(text, now or datetime.now())
+    if absolute_time is None:
+        import dateparser
+        absolute_time = dateparser.parse(text)
     if absolute_time is None:
         raise ValueError(f"无法解析字符串: {relative_str}")
+    if memo is not None:
+        memo[relative_str] = absolute_time
     return absolute_time
 
-def fetch_gelonghui() :
-    base_url = "https://www.gelonghui.com"
-    response = requests.get("https://www.gelonghui.com/news/")
-    response.raise_for_status()
-    html = response.text
-    soup = BeautifulSoup(html, "html.parser")
+def parse_gelonghui(html: str, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """解析格隆汇新闻列表页面（纯函数，在解析工作池中运行）"""
+    root = parse_html(html, backend)
     news_items = []
+    # 同一次抓取内使用同一个参考时间和解析缓存
+    now = datetime.now()
+    memo = {}
 
-    for el in soup.select(".article-content"):
-        a = el.select_one(".detail-right > a")
-        time_p = el.find("p", class_="time")
+    for el in root.css(".article-content"):
+        a = el.css_first(".detail-right > a")
+        time_p = el.css_first("p.time")
         if a:
-            url = a.get("href")
-            title = a.find("h2").get_text(strip=True) if a.find("h2") else ""
-            summary_tag = a.find("summary")
-            info_text = summary_tag.get_text(strip=True) if summary_tag else None
+            url = a.attr("href")
+            h2 = a.css_first("h2")
+            title = h2.text(strip=True) if h2 else ""
+            summary_tag = a.css_first("summary")
+            info_text = summary_tag.text(strip=True) if summary_tag else None
             if time_p :
-                time_spans = time_p.find_all("span")
-                time_text_str = time_spans[-1].get_text(strip=True) if time_spans else None
-                time_text_p = parse_relative_time(time_text_str)
+                time_spans = time_p.css("span")
+                time_text_str = time_spans[-1].text(strip=True) if time_spans else None
+                time_text_p = parse_relative_time(time_text_str, now, memo)
                 time_text = time_text_p.strftime('%Y-%m-%d %H:%M:%S')
 
             else:
@@ -48,14 +102,23 @@ def fetch_gelonghui() :
             if url and title:
                 news_items.append({
                     "title": title,
-                    "link": base_url + url,
+                    "link": BASE_URL + url,
                     "description": info_text,
                     "pubDate": time_text,
                 })
-    return {"gelonghui" : news_items}
+    return news_items
+
+async def fetch_gelonghui():
+    html, validators = await fetch_url_if_changed(f"{BASE_URL}/news/")
+    if html is None:
+        return {"gelonghui": []}
+    items = await parse_in_worker(parse_gelonghui, html)
+    # 校验信息在条目处理完成后随本轮提交一起保存
+    get_source_cursor("gelonghui").defer(validators.commit)
+    return {"gelonghui": items}
 
 # 示例用法
 if __name__ == "__main__":
-    news = fetch_gelonghui()
-    for item in news:
-        print(item)
\ No newline at end of file
+    news = run_with_session(fetch_gelonghui())
+    for item in news["gelonghui"]:
+        print(item)
@@ -4,9 +4,10 @@ import time
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
 
-import requests
-
-from crawler.async_news_fetcher import fetch_url
+from crawler.async_news_fetcher import fetch_url_if_changed
+from crawler.json_codec import decode
+from crawler.json_schemas import JIN10_FLASH
+from crawler.cursor_store import get_source_cursor
 
 
 def parse_relative_date(time_str: str, tz: str = "Asia/Shanghai") -> datetime:
@@ -29,23 +30,23 @@ def parse_relative_date(time_str: str, tz: str = "Asia/Shanghai") -> datetime:
 async def fetch_jin10_news() :
     timestamp = int(time.time() * 1000)
     url = f"https://www.jin10.com/flash_newest.js?t={timestamp}"
-    resp = await fetch_url(url)
+    # URL 中的时间戳只用于绕过缓存，校验信息按不带时间戳的地址保存
+    resp, validators = await fetch_url_if_changed(url, cache_key="https://www.jin10.com/flash_newest.js")
+    if resp is None:
+        return {"jin10": []}
     raw_data = resp
 
-    # 移除开头的变量声明和末尾的分号
-    json_str = re.sub(r'^var\s+newest\s*=\s*', '', raw_data)
-    json_str = re.sub(r';*$', '', json_str).strip()
+    # 截取 "var newest = [...];" 中的 JSON 数组，避免对全文做正则替换
+    json_str = raw_data[raw_data.find('['):raw_data.rfind(']') + 1]
+    data = decode(json_str, JIN10_FLASH)
 
-    data = []
-    try:
-        data = requests.utils.json.loads(json_str)
-    except Exception:
-        import json
-        data = json.loads(json_str)
+    # 先丢弃已处理过的快讯，再做正则和时间解析
+    cursor = get_source_cursor("jin10")
+    data = cursor.filter_new(data, id_key=lambda k: k.get("id"))
 
     result = []
     for k in data:
-        k_data = k.get('data', {})
+        k_data = k.get('data') or {}
         title_or_content = k_data.get('title') or k_data.get('content')
         if not title_or_content or 5 in (k.get('channel') or []):
             continue
@@ -58,7 +59,7 @@ async def fetch_jin10_news() :
         item = {
             "id": k.get("id"),
             "title": title,
-            "pubDate": int(parse_relative_date(k.get("time", ""), "Asia/Shanghai").timestamp() * 1000),
+            "pubDate": int(parse_relative_date(k.get("time") or "", "Asia/Shanghai").timestamp() * 1000),
             "url": f"https://flash.jin10.com/detail/{k.get('id')}",
             "extra": {
                 "hover": desc,
@@ -66,6 +67,8 @@ async def fetch_jin10_news() :
             }
         }
         result.append(item)
+    # 校验信息随高水位一起在条目处理完成后保存
+    cursor.defer(validators.commit)
     return {"jin10" : result}
 
 if __name__ == "__main__":
@@ -1,20 +1,25 @@
 import asyncio
 from typing import Dict, Any
 
-from crawler.async_news_fetcher import fetch_url_json
+from crawler.async_news_fetcher import fetch_url_json_if_changed
+from crawler.cursor_store import get_source_cursor
+from crawler.json_schemas import MKT_FLASH_HOST
 
 
 class Report:
     def __init__(self, data: Dict[str, Any], report_type: str):
         self.id = data.get("id")
-        self.title = data.get("data", {}).get("title") or data.get("data", {}).get("content")
+        flash_data = data.get("data") or {}
+        self.title = flash_data.get("title") or flash_data.get("content")
         self.pubDate = data.get("time")
         self.extra = {"info": report_type}
         self.url = f"https://mktnews.net/flashDetail.html?id={self.id}"
 
 async def fetch_mktnews():
     url = "https://api.mktnews.net/api/flash/host"
-    res = await fetch_url_json(url)
+    res, validators = await fetch_url_json_if_changed(url, schema=MKT_FLASH_HOST)
+    if res is None:
+        return {"mkt": []}
 
     categories = ["policy", "AI", "financial"]
     type_map = {"policy": "Policy", "AI": "AI", "financial": "Financial"}
@@ -22,12 +27,14 @@ async def fetch_mktnews():
     all_reports = []
     for category in categories:
         # Find the category object
-        cat_obj = next((item for item in res["data"] if item["name"] == category), None)
+        cat_obj = next((item for item in res.get("data") or [] if item.get("name") == category), None)
         flash_list = []
         if cat_obj and cat_obj.get("child"):
-            flash_list = cat_obj["child"][0].get("flash_list", [])
-        for item in flash_list:
-            all_reports.append(Report(item, type_map[category]))
+            flash_list = cat_obj["child"][0].get("flash_list") or []
+        # 每个分类单独记高水位：同一条快讯可能出现在多个分类中，各分类都要保留
+        cursor = get_source_cursor(f"mkt:{category}")
+        flash_list = cursor.filter_new(flash_list, id_key=lambda k: k.get("id"), sort_key=lambda k: k.get("time"))
+        all_reports.extend(Report(item, type_map[category]) for item in flash_list)
 
     # Sort by pubDate descending (assuming ISO format)
     all_reports.sort(key=lambda r: r.pubDate, reverse=True)
@@ -41,6 +48,8 @@ async def fetch_mktnews():
             "extra": report.extra,
             "url": report.url,
         })
+    # 校验信息随高水位一起在条目处理完成后保存
+    cursor.defer(validators.commit)
     return {"mkt" : result}
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 import asyncio
 
-from crawler.async_news_fetcher import fetch_url_json
+from crawler.async_news_fetcher import fetch_url_json_if_changed
+from crawler.cursor_store import get_source_cursor
+from crawler.json_schemas import TOUTIAO_HOT_BOARD
 
 
 def proxy_picture(url, mode):
@@ -10,8 +12,10 @@ def proxy_picture(url, mode):
 
 async def fetch_toutiao_hot_events():
     url = "https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc"
-    res = await fetch_url_json(url)
-    data = res.get("data", [])
+    res, validators = await fetch_url_json_if_changed(url, schema=TOUTIAO_HOT_BOARD)
+    if res is None:
+        return {"toutiao": []}
+    data = res.get("data") or []
     result = []
     for k in data:
         item = {
@@ -19,10 +23,12 @@ async def fetch_toutiao_hot_events():
             "title": k.get("Title"),
             "url": f"https://www.toutiao.com/trending/{k.get('ClusterIdStr')}/",
             "extra": {
-                "icon": proxy_picture(k.get("LabelUri", {}).get("url"), "encodeBase64URL") if k.get("LabelUri") and k["LabelUri"].get("url") else None
+                "icon": proxy_picture(k["LabelUri"]["url"], "encodeBase64URL") if k.get("LabelUri") and k["LabelUri"].get("url") else None
             }
         }
         result.append(item)
+    # 校验信息在条目处理完成后随本轮提交一起保存
+    get_source_cursor("toutiao").defer(validators.commit)
     return {"toutiao" : result}
 
 # Example usage
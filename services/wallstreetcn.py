@@ -1,14 +1,23 @@
-import asyncio
 from typing import List, Dict, Any
 
-from crawler.async_news_fetcher import fetch_url_json
+from crawler.async_news_fetcher import fetch_url_json_if_changed
+from crawler.cursor_store import get_source_cursor
+from crawler.json_schemas import WALLSTCN_LIVES, WALLSTCN_FLOW, WALLSTCN_HOT
+from crawler.http_pool import run_with_session
 
 
 async def wall_streetcn_live() -> List[Dict[str, Any]]:
     api_url = "https://api-one.wallstcn.com/apiv1/content/lives?channel=global-channel&limit=30"
-    res = await fetch_url_json(api_url)
-    items = res.get('data', {}).get('items', [])
-    return [
+    res, validators = await fetch_url_json_if_changed(api_url, schema=WALLSTCN_LIVES)
+    if res is None:
+        return []
+    items = (res.get('data') or {}).get('items') or []
+    # 先丢弃已处理过的快讯
+    cursor = get_source_cursor("wallstreetcn")
+    items = cursor.filter_new(
+        items, id_key=lambda k: k["id"], sort_key=lambda k: k["display_time"]
+    )
+    result = [
         {
             "id": k["id"],
             "title": k.get("title") or k.get("content_text"),
@@ -19,15 +28,20 @@ async def wall_streetcn_live() -> List[Dict[str, Any]]:
         }
         for k in items
     ]
+    # 校验信息随高水位一起在条目处理完成后保存
+    cursor.defer(validators.commit)
+    return result
 
 async def wallstreetcn_news() -> List[Dict[str, Any]]:
     api_url = "https://api-one.wallstcn.com/apiv1/content/information-flow?channel=global-channel&accept=article&limit=30"
-    res = await fetch_url_json(api_url)
-    items = res.get('data', {}).get('items', [])
+    res, validators = await fetch_url_json_if_changed(api_url, schema=WALLSTCN_FLOW)
+    if res is None:
+        return []
+    items = (res.get('data') or {}).get('items') or []
     result = []
     for k in items:
         resource_type = k.get("resource_type")
-        resource = k.get("resource", {})
+        resource = k.get("resource") or {}
         if resource_type not in ["theme", "ad"] and resource.get("type") != "live" and resource.get("uri"):
             result.append({
                 "id": resource["id"],
@@ -37,28 +51,37 @@ async def wallstreetcn_news() -> List[Dict[str, Any]]:
                 },
                 "url": resource["uri"],
             })
+    get_source_cursor("wallstreetcn-news").defer(validators.commit)
     return result
 
 async def wallstreetcn_hot() -> List[Dict[str, Any]]:
     api_url = "https://api-one.wallstcn.com/apiv1/content/articles/hot?period=all"
-    res = await fetch_url_json(api_url)
-    day_items = res.get('data', {}).get('day_items', [])
-    return [
+    res, validators = await fetch_url_json_if_changed(api_url, schema=WALLSTCN_HOT)
+    if res is None:
+        return []
+    day_items = (res.get('data') or {}).get('day_items') or []
+    result = [
         {
             "id": h["id"],
-            "title": h.get("title", ""),
+            "title": h.get("title") or "",
             "url": h["uri"],
         }
         for h in day_items
     ]
+    get_source_cursor("wallstreetcn-hot").defer(validators.commit)
+    return result
 
-def get_wallstree():
+async def _wallstree_all():
+    # 三个接口同属 api-one.wallstcn.com，共用同一个连接池
     return {
-        "wallstreetcn": asyncio.run(wall_streetcn_live()),
-        "wallstreetcn-news": asyncio.run(wallstreetcn_news()),
-        "wallstreetcn-hot": asyncio.run(wallstreetcn_hot()),
+        "wallstreetcn": await wall_streetcn_live(),
+        "wallstreetcn-news": await wallstreetcn_news(),
+        "wallstreetcn-hot": await wallstreetcn_hot(),
     }
 
+def get_wallstree():
+    return run_with_session(_wallstree_all())
+
 # Example usage:
 
 if __name__ == "__main__":
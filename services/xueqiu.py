@@ -1,26 +1,45 @@
-import requests
-
-def get_hot_stocks():
-    session = requests.Session()
-    # 访问主页获取 cookies，模拟浏览器
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/javascript, */*; q=0.01",
-        "Accept-Language": "zh-CN,zh;q=0.9",
-        "Referer": "https://xueqiu.com/hq",
-        "X-Requested-With": "XMLHttpRequest",
-    }
-    homepage = session.get("https://xueqiu.com/hq", headers=headers)
-    # 获取 cookies
-    cookies = session.cookies.get_dict()
-    cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
-    # 请求数据接口
-    url = "https://stock.xueqiu.com/v5/stock/hot_stock/list.json?size=30&_type=10&type=10"
-    headers["Cookie"] = cookie_str
-    res = session.get(url, headers=headers)
-    print(res.status_code, res.text)
-    data = res.json()
-    # 后续解析同前
+from config import Config
+from crawler.async_news_fetcher import fetch_cookies, fetch_url_json
+from crawler.http_pool import run_with_session
+from crawler.ttl_cache import TTLCache
+
+HOMEPAGE_URL = "https://xueqiu.com/hq"
+HOT_STOCK_URL = "https://stock.xueqiu.com/v5/stock/hot_stock/list.json?size=30&_type=10&type=10"
+
+# 模拟浏览器
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Accept-Language": "zh-CN,zh;q=0.9",
+    "Referer": "https://xueqiu.com/hq",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
+# 主页下发的 cookies，在过期或鉴权失败前复用
+_cookie_cache = TTLCache(maxsize=1, ttl=Config.XUEQIU_COOKIE_TTL)
+
+
+async def _get_cookie_header(refresh=False):
+    cookie_str = None if refresh else _cookie_cache.get("cookie")
+    if cookie_str is None:
+        # 访问主页获取 cookies
+        cookies = await fetch_cookies(HOMEPAGE_URL, headers=HEADERS)
+        cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
+        _cookie_cache.set("cookie", cookie_str)
+    return cookie_str
+
+def _is_auth_failure(data):
+    # cookies 失效时接口返回 error_code（如 400016）且没有 data
+    return not isinstance(data, dict) or data.get("error_code") or not data.get("data")
+
+async def get_hot_stocks():
+    data = await fetch_url_json(HOT_STOCK_URL, headers={**HEADERS, "Cookie": await _get_cookie_header()})
+    if _is_auth_failure(data):
+        # 鉴权失败时刷新 cookies 重试一次
+        data = await fetch_url_json(HOT_STOCK_URL, headers={**HEADERS, "Cookie": await _get_cookie_header(refresh=True)})
+        if _is_auth_failure(data):
+            raise RuntimeError(f"雪球接口鉴权失败: {data}")
+
     items = data["data"]["items"]
     results = []
     for k in items:
@@ -37,4 +56,4 @@ def get_hot_stocks():
 
 
 if __name__ == "__main__":
-    print(get_hot_stocks())
\ No newline at end of file
+    print(run_with_session(get_hot_stocks()))